@@ -1,38 +1,288 @@
 import os
+
+# Evitar o import do dnspython pelo eventlet (greendns), que domina o tempo de
+# cold start. A única resolução de nomes do servidor é a do successor_url no
+# drain, que sem greendns bloqueia o hub: passe o sucessor por IP (ver README)
+os.environ.setdefault('EVENTLET_NO_GREENDNS', 'yes')
+
 from flask import Flask, request, jsonify
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask_socketio import SocketIO
 from flask_cors import CORS
-import uuid
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from utils.game_manager import GameManager
+from utils.room_actors import RoomActorSystem
+from utils.latency import RttTracker
+from utils import migration
+from utils.tournament import TournamentCoordinator
+from utils.sessions import Session, SessionRegistry, normalize_identity
+from utils.event_trace import EventTraceRecorder
+from utils.transport import FlaskSocketIOTransport
+from functools import wraps
+import config
+
+class NotModifiedMiddleware:
+    """
+    Enviar respostas 304 sem corpo e com Content-Length: 0.
+
+    O werkzeug remove o Content-Length de respostas 304 e, sem ele, o servidor
+    WSGI do eventlet envia a resposta como chunked: o terminador '0\\r\\n\\r\\n'
+    fica na conexão keep-alive e corrompe a resposta seguinte. Caches não
+    substituem o Content-Length guardado pelo de um 304 (RFC 9111, 3.2).
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        not_modified = []
+
+        def start(status, headers, exc_info=None):
+            if status.startswith('304'):
+                not_modified.append(True)
+                headers = [
+                    (name, value) for name, value in headers
+                    if name.lower() not in ('content-length', 'transfer-encoding')
+                ]
+                headers.append(('Content-Length', '0'))
+            return start_response(status, headers, exc_info)
+
+        result = self.wsgi_app(environ, start)
+        if not not_modified:
+            return result
+
+        if hasattr(result, 'close'):
+            result.close()
+        return []
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'party-challenges-secret-key-2024'
+app.wsgi_app = NotModifiedMiddleware(app.wsgi_app)
 
-# Configurar CORS
-CORS(app, origins=["*"])
+# Configurar CORS (ETag exposto para o cache do cliente; preflight do
+# If-None-Match guardado pelo navegador para não dobrar cada consulta)
+CORS(app, origins=["*"], expose_headers=["ETag"],
+     max_age=config.Config.CORS_MAX_AGE)
 
 # Configurar Socket.IO
 socketio = SocketIO(
     app, 
     cors_allowed_origins="*",
-    async_mode='eventlet',
-    logger=True,
-    engineio_logger=True,
-    ping_timeout=60,
-    ping_interval=25
+    async_mode=config.Config.SOCKETIO_ASYNC_MODE,
+    logger=config.Config.SOCKETIO_VERBOSE_LOGS,
+    engineio_logger=config.Config.SOCKETIO_VERBOSE_LOGS,
+    ping_timeout=config.Config.SOCKETIO_PING_TIMEOUT,
+    ping_interval=config.Config.SOCKETIO_PING_INTERVAL
 )
 
-# Inicializar gerenciador de jogo
+# Inicializar gerenciador de jogo (desafios são carregados no warmup)
 game_manager = GameManager()
 
-# Dicionário para armazenar informações dos jogadores conectados
-connected_players = {}
+def warmup():
+    """Carregar o pacote padrão fora do import para acelerar o cold start"""
+    try:
+        # Estatísticas antes do pacote: o primeiro sorteio já sai balanceado
+        game_manager.analytics.load()
+        game_manager.warm_up()
+    except Exception as e:
+        print(f"Erro no warmup: {str(e)}")
+
+socketio.start_background_task(warmup)
+
+def flush_challenge_stats_loop():
+    """Gravar periodicamente as estatísticas de respostas por desafio"""
+    while True:
+        socketio.sleep(config.Config.CHALLENGE_STATS_FLUSH_INTERVAL)
+        try:
+            game_manager.analytics.flush()
+        except Exception as e:
+            print(f"Erro ao gravar estatísticas de desafios: {str(e)}")
+
+socketio.start_background_task(flush_challenge_stats_loop)
+
+def refill_room_pool_loop():
+    """Manter salas pré-montadas prontas, fora do caminho das requisições"""
+    while True:
+        socketio.sleep(config.Config.ROOM_POOL_REFILL_INTERVAL)
+        if not game_manager.is_ready() or drain_state['draining']:
+            continue
+        try:
+            # Montar em lotes pequenos, cedendo o loop entre eles
+            while game_manager.room_pool.refill(config.Config.ROOM_POOL_REFILL_BATCH):
+                socketio.sleep(0)
+        except Exception as e:
+            print(f"Erro ao reabastecer pool de salas: {str(e)}")
+
+socketio.start_background_task(refill_room_pool_loop)
+
+# Quem está conectado e em qual sala (índices por sid, sala e identidade)
+sessions = SessionRegistry()
+
+# Envio para os clientes pelo servidor que mantém as conexões: o Flask-SocketIO
+# aqui, o AsyncServer no modo ASGI (asgi.py troca com use_transport)
+transport = FlaskSocketIOTransport(socketio)
+
+# Cada sala ativa processa seus eventos em ordem em um único worker
+room_actors = RoomActorSystem(
+    emit=transport.emit,
+    spawn=socketio.start_background_task,
+    mode=config.Config.ROOM_ACTOR_MODE,
+    threads=config.Config.ROOM_ACTOR_THREADS,
+    max_batch=config.Config.ROOM_ACTOR_MAX_BATCH
+)
+
+# Torneios: várias salas com a mesma sequência de desafios e ranking global
+# (o placar de cada sala é lido dentro do ator dela)
+tournaments = TournamentCoordinator(game_manager, room_call=room_actors.call)
+
+def reap_empty_rooms_loop():
+    """Remover salas em que ninguém entrou dentro do TTL, liberando os códigos"""
+    while True:
+        socketio.sleep(config.Config.EMPTY_ROOM_REAP_INTERVAL)
+        if drain_state['draining']:
+            continue
+        try:
+            ttl = config.Config.EMPTY_ROOM_TTL
+            for room_id in game_manager.get_expired_empty_rooms(ttl):
+                # Checagem repetida no ator: um join pode estar na fila da sala
+                room_actors.call(room_id, game_manager.delete_expired_empty_room, room_id, ttl)
+        except Exception as e:
+            print(f"Erro ao remover salas vazias: {str(e)}")
+
+socketio.start_background_task(reap_empty_rooms_loop)
+
+def use_transport(new_transport):
+    """Trocar o servidor usado para enviar aos clientes (inclusive pelos atores)"""
+    global transport
+    transport = new_transport
+    room_actors.emit = new_transport.emit
+
+# Cache de respostas serializadas de /api/room, chaveado por (sala, versão)
+room_info_cache = OrderedDict()
+room_info_cache_lock = threading.Lock()
+
+# As versões recomeçam a cada processo (inclusive no sucessor de um drain):
+# o nonce impede que um ETag antigo valide um estado diferente
+etag_nonce = secrets.token_hex(4)
+
+# Estado de drain (migração das salas para um processo sucessor)
+drain_state = {
+    'draining': False,
+    'done': False,
+    'successor_url': None,
+    'migrated': 0,
+    'failed': 0,
+    'pauses': []
+}
+
+# Tokens de retomada recebidos de um processo anterior
+resume_registry = migration.ResumeRegistry(ttl=config.Config.MIGRATION_RESUME_TTL)
+
+# RTT estimado por conexão (sondas rtt_ping confirmadas pelo cliente)
+rtt_tracker = RttTracker()
+
+def send_rtt_probe(sid):
+    """Enviar sonda de RTT; o ack do cliente fecha a medição"""
+    sent_at = time.monotonic()
+    
+    def on_ack(*args):
+        rtt_tracker.record(sid, time.monotonic() - sent_at)
+    
+    transport.emit('rtt_ping', {}, to=sid, callback=on_ack)
+
+def probe_rtt_loop():
+    """Medir continuamente o RTT de todos os jogadores em salas"""
+    while True:
+        socketio.sleep(config.Config.RTT_PROBE_INTERVAL)
+        for sid in sessions.sids():
+            try:
+                send_rtt_probe(sid)
+            except Exception as e:
+                print(f"Erro ao medir RTT de {sid}: {str(e)}")
+
+socketio.start_background_task(probe_rtt_loop)
+
+# Trace dos eventos recebidos (opcional), para replay offline de tráfego real
+event_trace = None
+if config.Config.EVENT_TRACE_FILE:
+    event_trace = EventTraceRecorder(config.Config.EVENT_TRACE_FILE,
+                                     max_bytes=config.Config.EVENT_TRACE_MAX_BYTES)
+
+def traced(event):
+    """Registrar o evento no trace antes do handler (sem custo quando desativado)"""
+    def decorator(handler):
+        if event_trace is None:
+            return handler
+        
+        @wraps(handler)
+        def wrapper(sid, *args):
+            try:
+                event_trace.record(event, sid, args[0] if args else None)
+            except Exception as e:
+                print(f"Erro ao gravar trace de {event}: {str(e)}")
+            return handler(sid, *args)
+        return wrapper
+    return decorator
+
+def flush_event_trace_loop():
+    """Descarregar periodicamente o buffer do trace de eventos"""
+    while True:
+        socketio.sleep(config.Config.EVENT_TRACE_FLUSH_INTERVAL)
+        try:
+            event_trace.flush()
+        except Exception as e:
+            print(f"Erro ao gravar trace de eventos: {str(e)}")
+
+if event_trace is not None:
+    socketio.start_background_task(flush_event_trace_loop)
+
+def read_room_info_body(room_id):
+    """
+    Ler versão e JSON serializado da sala de uma vez (executado no ator da
+    sala), reutilizando o cache se a versão não mudou.
+    Retorna (None, None) se a sala não existir.
+    """
+    version = game_manager.get_room_version(room_id)
+    if version is None:
+        return None, None
+    
+    key = (room_id, version)
+    with room_info_cache_lock:
+        body = room_info_cache.get(key)
+        if body is not None:
+            room_info_cache.move_to_end(key)
+            return version, body
+    
+    body = app.json.response(game_manager.get_room_info(room_id)).get_data()
+    with room_info_cache_lock:
+        room_info_cache[key] = body
+        if len(room_info_cache) > config.Config.ROOM_INFO_CACHE_SIZE:
+            room_info_cache.popitem(last=False)
+    
+    return version, body
 
 @app.route('/')
 def index():
     return jsonify({"message": "Party Challenges API está rodando!"})
 
+@app.route('/healthz')
+def healthz():
+    """Readiness: pronto apenas quando o worker consegue criar e servir salas"""
+    if drain_state['draining']:
+        return jsonify({'status': 'draining'}), 503
+    
+    if not game_manager.is_ready():
+        return jsonify({'status': 'starting'}), 503
+    
+    return jsonify({
+        'status': 'ready',
+        'rooms': len(game_manager.rooms),
+        'active_room_actors': room_actors.active_rooms()
+    })
+
 @app.route('/api/create-room', methods=['POST'])
 def create_room():
     """Criar uma nova sala de jogo"""
@@ -45,56 +295,584 @@ def create_room():
         if not player_name:
             return jsonify({'error': 'Nome do jogador é obrigatório'}), 400
         
-        # Gerar ID único para a sala
-        room_id = str(uuid.uuid4())[:8].upper()
+        if drain_state['draining']:
+            return jsonify({'error': 'Servidor reiniciando, tente novamente em instantes'}), 503
+        
+        pack = data.get('pack') or config.Config.DEFAULT_CHALLENGE_PACK
+        if not isinstance(pack, str) or not game_manager.pack_exists(pack):
+            return jsonify({'error': 'Pacote de desafios não encontrado'}), 400
+        
+        # Gerar código único para a sala
+        room_id = game_manager.room_codes.allocate()
         
         # Criar sala VAZIA (jogador se conecta via WebSocket)
-        room = game_manager.create_empty_room(room_id)
+        room = game_manager.create_empty_room(room_id, pack)
         
         return jsonify({
             'room_id': room_id,
             'player_name': player_name,
+            'pack': room.challenge_pack,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/rooms/bulk', methods=['POST'])
+def create_rooms_bulk():
+    """Criar várias salas vazias de uma vez (eventos, salas de aula)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        count = data.get('count')
+        
+        # bool é subclasse de int: True passaria como 1
+        if (not isinstance(count, int) or isinstance(count, bool)
+                or not 1 <= count <= config.Config.ROOMS_BULK_MAX):
+            return jsonify({
+                'error': f'count deve estar entre 1 e {config.Config.ROOMS_BULK_MAX}'
+            }), 400
+        
+        if drain_state['draining']:
+            return jsonify({'error': 'Servidor reiniciando, tente novamente em instantes'}), 503
+        
+        pack = data.get('pack') or config.Config.DEFAULT_CHALLENGE_PACK
+        if not isinstance(pack, str) or not game_manager.pack_exists(pack):
+            return jsonify({'error': 'Pacote de desafios não encontrado'}), 400
+        
+        room_ids = []
+        for _ in range(count):
+            room_id = game_manager.room_codes.allocate()
+            game_manager.create_empty_room(room_id, pack)
+            room_ids.append(room_id)
+        
+        return jsonify({
+            'room_ids': room_ids,
+            'pack': pack,
             'success': True
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/challenge-packs', methods=['GET'])
+def list_challenge_packs():
+    """Listar pacotes de desafios disponíveis"""
+    try:
+        return jsonify({
+            'packs': game_manager.catalog.list_packs(),
+            'default': config.Config.DEFAULT_CHALLENGE_PACK
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/challenge-stats', methods=['GET'])
+def get_challenge_stats():
+    """Estatísticas de respostas por desafio de um pacote (acertos, tempos, dificuldade)"""
+    try:
+        pack = request.args.get('pack') or config.Config.DEFAULT_CHALLENGE_PACK
+        if not game_manager.pack_exists(pack):
+            return jsonify({'error': 'Pacote de desafios não encontrado'}), 404
+        
+        return jsonify({
+            'pack': pack,
+            'challenges': game_manager.get_challenge_stats(pack)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas do servidor, incluindo a distribuição de RTT por sala"""
+    try:
+        room_sids = sessions.rooms()
+        
+        return jsonify({
+            'rooms': len(game_manager.rooms),
+            'connected_players': len(sessions),
+            'connected_identities': sessions.identity_count(),
+            'room_pool': game_manager.room_pool.stats(),
+            'event_trace': event_trace.stats() if event_trace else None,
+            'rtt_ms': {
+                room_id: rtt_tracker.distribution(sids)
+                for room_id, sids in room_sids.items()
+            }
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/room/<room_id>', methods=['GET'])
 def get_room_info(room_id):
     """Obter informações da sala"""
     try:
-        room_info = game_manager.get_room_info(room_id)
+        # Versão e corpo lidos no mesmo turno do ator: o ETag sempre descreve o corpo
+        version, body = room_actors.call(room_id, read_room_info_body, room_id)
         
-        if not room_info:
+        if version is None:
             return jsonify({'error': 'Sala não encontrada'}), 404
         
-        return jsonify(room_info)
+        # Cliente já tem a versão atual: responder 304 sem corpo
+        etag = f'{room_id}-{etag_nonce}-{version}'
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/rooms/status', methods=['POST'])
+def get_rooms_status():
+    """Obter status de várias salas em uma única requisição"""
+    try:
+        data = request.get_json(silent=True)
+        room_ids = data.get('room_ids') if isinstance(data, dict) else None
+        
+        if not isinstance(room_ids, list) or not all(isinstance(room_id, str) for room_id in room_ids):
+            return jsonify({'error': 'room_ids deve ser uma lista de IDs'}), 400
+        
+        if len(room_ids) > config.Config.ROOMS_STATUS_MAX_IDS:
+            return jsonify({
+                'error': f'Máximo de {config.Config.ROOMS_STATUS_MAX_IDS} salas por consulta'
+            }), 400
+        
+        return jsonify({'rooms': {
+            room_id: room_actors.call(room_id, game_manager.get_room_status, room_id)
+            for room_id in room_ids
+        }})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def process_tournament_round(outbox, room_id, tournament_id, action, leaderboard):
+    """Aplicar passo do torneio em uma sala (executado no ator da sala)"""
+    room = tournaments.tournament_room(tournament_id, room_id)
+    if not room:
+        return
+    
+    if leaderboard:
+        outbox.emit('tournament_leaderboard', leaderboard, to=room_id)
+    
+    if action == 'start':
+        if not game_manager.start_game(room_id):
+            return
+        outbox.emit('game_started', {'message': 'O torneio começou!'}, to=room_id)
+        outbox.emit('new_challenge', game_manager.get_current_challenge(room_id), to=room_id)
+    elif not room.game_started:
+        # Sala que não conseguiu iniciar (jogadores insuficientes) fica de fora
+        return
+    elif action == 'next':
+        challenge = game_manager.next_challenge(room_id)
+        if challenge:
+            outbox.emit('new_challenge', challenge, to=room_id)
+    elif action == 'end':
+        outbox.emit('game_ended', game_manager.get_final_results(room_id), to=room_id)
+
+def get_authorized_tournament(tournament_id):
+    """Obter torneio validando o token do organizador; retorna (torneio, resposta de erro)"""
+    tournament = tournaments.get_tournament(tournament_id)
+    if not tournament:
+        return None, (jsonify({'error': 'Torneio não encontrado'}), 404)
+    
+    if not tournament.check_token(request.headers.get('X-Organizer-Token')):
+        return None, (jsonify({'error': 'Token do organizador inválido'}), 403)
+    
+    return tournament, None
+
+@app.route('/api/tournament', methods=['POST'])
+def create_tournament():
+    """Criar torneio com várias salas compartilhando os mesmos desafios"""
+    try:
+        data = request.get_json(silent=True) or {}
+        room_count = data.get('rooms')
+        
+        if not isinstance(room_count, int) or not 1 <= room_count <= config.Config.TOURNAMENT_MAX_ROOMS:
+            return jsonify({
+                'error': f'rooms deve estar entre 1 e {config.Config.TOURNAMENT_MAX_ROOMS}'
+            }), 400
+        
+        if drain_state['draining']:
+            return jsonify({'error': 'Servidor reiniciando, tente novamente em instantes'}), 503
+        
+        pack = data.get('pack') or config.Config.DEFAULT_CHALLENGE_PACK
+        if not isinstance(pack, str) or not game_manager.pack_exists(pack):
+            return jsonify({'error': 'Pacote de desafios não encontrado'}), 400
+        
+        room_ids = [game_manager.room_codes.allocate() for _ in range(room_count)]
+        tournament = tournaments.create_tournament(room_ids, pack)
+        
+        return jsonify({
+            'tournament': tournament.to_dict(),
+            'organizer_token': tournament.organizer_token,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournament/<tournament_id>', methods=['GET'])
+def get_tournament(tournament_id):
+    """Estado do torneio e ranking global"""
+    try:
+        tournament = tournaments.get_tournament(tournament_id)
+        if not tournament:
+            return jsonify({'error': 'Torneio não encontrado'}), 404
+        
+        limit = request.args.get('top', config.Config.TOURNAMENT_TOP_N, type=int)
+        return jsonify({
+            'tournament': tournament.to_dict(),
+            'leaderboard': tournaments.get_leaderboard(tournament, max(1, min(limit, 100)))
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournament/<tournament_id>/start', methods=['POST'])
+def start_tournament(tournament_id):
+    """Iniciar todas as salas do torneio ao mesmo tempo"""
+    try:
+        tournament, error = get_authorized_tournament(tournament_id)
+        if error:
+            return error
+        
+        with tournaments.lock:
+            if tournament.started:
+                return jsonify({'error': 'Torneio já iniciado'}), 409
+            tournament.started = True
+            tournament.current_challenge_index = 0
+        
+        for room_id in tournament.room_ids:
+            room_actors.post(room_id, process_tournament_round, room_id, tournament.id, 'start', None)
+        
+        return jsonify({'tournament': tournament.to_dict()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/tournament/<tournament_id>/next-round', methods=['POST'])
+def next_tournament_round(tournament_id):
+    """Fechar a rodada, enviar o ranking global e avançar todas as salas juntas"""
+    try:
+        tournament, error = get_authorized_tournament(tournament_id)
+        if error:
+            return error
+        
+        with tournaments.lock:
+            if not tournament.started or tournament.ended:
+                return jsonify({'error': 'Torneio não está em andamento'}), 409
+            
+            # Ranking da rodada encerrada, calculado uma vez e reaproveitado por todas as salas
+            leaderboard = tournaments.get_leaderboard(tournament, config.Config.TOURNAMENT_TOP_N)
+            
+            if tournament.has_next_challenge():
+                tournament.current_challenge_index += 1
+                action = 'next'
+            else:
+                tournament.ended = True
+                action = 'end'
+        
+        for room_id in tournament.room_ids:
+            room_actors.post(room_id, process_tournament_round, room_id, tournament.id, action, leaderboard)
+        
+        return jsonify({'tournament': tournament.to_dict(), 'leaderboard': leaderboard})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@socketio.on('connect')
-def handle_connect():
-    emit('connected', {'message': 'Conectado ao servidor!'})
+def require_migration_secret():
+    """Endpoints internos exigem MIGRATION_SECRET configurado e correto"""
+    return migration.check_secret(
+        config.Config.MIGRATION_SECRET,
+        request.headers.get(migration.MIGRATION_SECRET_HEADER)
+    )
+
+def export_room_for_migration(room_id):
+    """Congelar e serializar sala com suas sessões (executado no ator da sala)"""
+    state = game_manager.export_room(room_id)
+    if not state:
+        return None
+    
+    room_sessions = {session.sid: session.to_dict() for session in sessions.evict_room(room_id)}
+    state['sessions'] = room_sessions
+    
+    # O torneio vai junto: sem ele o sucessor recusaria os comandos do host
+    # (sala de torneio) e do organizador (torneio não encontrado)
+    tournament = tournaments.get_tournament(state.get('tournament_id'))
+    if tournament:
+        state['tournament'] = tournament.to_state()
+    state['resume_tokens'] = {migration.new_resume_token(): sid for sid in room_sessions}
+    return state
+
+def restore_room(state):
+    """Devolver ao processo uma sala cuja migração falhou"""
+    room_sessions = state.get('sessions', {})
+    if game_manager.import_room(state):
+        closed = sessions.restore(Session.from_dict(sid, data) for sid, data in room_sessions.items())
+        # Quem desconectou durante a migração não tem mais quem o remova
+        for session in closed:
+            room_actors.post(state['id'], process_remove_player, state['id'], session.sid)
+
+def drain_to(successor_url, reconnect_url=None):
+    """Migrar todas as salas para o sucessor, em lotes, e avisar os clientes"""
+    room_ids = list(game_manager.rooms)
+    batch_size = config.Config.MIGRATION_BATCH_SIZE
+    
+    for start in range(0, len(room_ids), batch_size):
+        frozen = []
+        for room_id in room_ids[start:start + batch_size]:
+            state = room_actors.call(room_id, export_room_for_migration, room_id)
+            if state:
+                frozen.append((time.monotonic(), state))
+        
+        if not frozen:
+            continue
+        
+        try:
+            result = migration.send_rooms(
+                successor_url, config.Config.MIGRATION_SECRET, [state for _, state in frozen]
+            )
+            accepted = set(result.get('accepted', []))
+        except Exception as e:
+            print(f"Erro ao migrar salas para {successor_url}: {str(e)}")
+            accepted = set()
+        
+        acked_at = time.monotonic()
+        for frozen_at, state in frozen:
+            if state['id'] not in accepted:
+                restore_room(state)
+                drain_state['failed'] += 1
+                continue
+            
+            drain_state['migrated'] += 1
+            drain_state['pauses'].append(acked_at - frozen_at)
+            for token, sid in state['resume_tokens'].items():
+                transport.emit('server_migrating', {
+                    'room_id': state['id'],
+                    'resume_token': token,
+                    'reconnect_url': reconnect_url
+                }, to=sid)
+    
+    # Salvar estatísticas antes de o processo ser encerrado
+    try:
+        game_manager.analytics.flush()
+    except Exception as e:
+        print(f"Erro ao gravar estatísticas de desafios: {str(e)}")
+    
+    if event_trace is not None:
+        try:
+            event_trace.flush()
+        except Exception as e:
+            print(f"Erro ao gravar trace de eventos: {str(e)}")
+    
+    drain_state['done'] = True
+
+@app.route('/internal/drain', methods=['GET', 'POST'])
+def drain():
+    """Iniciar (POST) ou consultar (GET) o drain deste worker"""
+    if not require_migration_secret():
+        return jsonify({'error': 'Não encontrado'}), 404
+    
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        successor_url = data.get('successor_url')
+        if not isinstance(successor_url, str) or not successor_url:
+            return jsonify({'error': 'successor_url é obrigatório'}), 400
+        
+        if drain_state['draining']:
+            return jsonify({'error': 'Drain já em andamento'}), 409
+        
+        drain_state['draining'] = True
+        drain_state['successor_url'] = successor_url
+        socketio.start_background_task(drain_to, successor_url, data.get('reconnect_url'))
+        return jsonify({'status': 'draining'}), 202
+    
+    pauses = sorted(drain_state['pauses'])
+    return jsonify({
+        'draining': drain_state['draining'],
+        'done': drain_state['done'],
+        'migrated': drain_state['migrated'],
+        'failed': drain_state['failed'],
+        'remaining_rooms': len(game_manager.rooms),
+        'pause_ms': {
+            'p50': round(pauses[len(pauses) // 2] * 1000, 2),
+            'p95': round(pauses[min(len(pauses) - 1, int(len(pauses) * 0.95))] * 1000, 2),
+            'max': round(pauses[-1] * 1000, 2)
+        } if pauses else None
+    })
+
+@app.route('/internal/migrate', methods=['POST'])
+def receive_migrated_rooms():
+    """Receber salas serializadas de um worker em drain"""
+    if not require_migration_secret():
+        return jsonify({'error': 'Não encontrado'}), 404
+    
+    data = request.get_json(silent=True) or {}
+    accepted, rejected = [], []
+    for state in data.get('rooms', []):
+        resume_tokens = state.pop('resume_tokens', {})
+        room_sessions = state.pop('sessions', {})
+        tournament_state = state.pop('tournament', None)
+        try:
+            if tournament_state:
+                tournaments.import_tournament(tournament_state)
+            elif not tournaments.get_tournament(state.get('tournament_id')):
+                # Torneio desconhecido: a sala segue como sala comum, controlada pelo host
+                state['tournament_id'] = None
+            imported = game_manager.import_room(state)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Sala inválida na migração: {str(e)}")
+            imported = False
+        
+        if not imported:
+            rejected.append(state.get('id'))
+            continue
+        
+        for token, old_sid in resume_tokens.items():
+            resume_registry.add(token, state['id'], old_sid, room_sessions.get(old_sid, {}))
+        accepted.append(state['id'])
+    
+    return jsonify({'accepted': accepted, 'rejected': rejected})
+
+def sweep_resumes_loop():
+    """Remover jogadores migrados que não retomaram a sessão a tempo"""
+    while True:
+        socketio.sleep(10)
+        for entry in resume_registry.pop_expired():
+            room_actors.post(entry['room_id'], process_remove_player, entry['room_id'], entry['old_sid'])
+
+socketio.start_background_task(sweep_resumes_loop)
 
-@socketio.on('disconnect')
-def handle_disconnect():
+# Handlers dos eventos Socket.IO. Não dependem do servidor: recebem o sid da
+# conexão e enviam pelo transport, e são registrados tanto no Flask-SocketIO
+# (final deste arquivo) quanto no socketio.AsyncServer do asgi.py.
+# Apenas validam o payload e enfileiram o evento no ator da sala, onde o estado
+# da sala é alterado. O registro de sessões é compartilhado (com lock): a
+# desconexão remove a sessão fora do ator, e entradas ainda na fila de uma
+# conexão encerrada são recusadas pelo registro (sessions.bind/restore)
+
+@traced('connect')
+def handle_connect(sid, auth=None):
+    sessions.connect(sid)
+    transport.emit('connected', {'message': 'Conectado ao servidor!'}, to=sid)
+
+def process_remove_player(outbox, room_id, sid, notify=True):
+    """Remover jogador da sala (executado no ator da sala)"""
+    game_manager.remove_player(room_id, sid)
+    
+    if notify:
+        room_players = game_manager.get_room_players(room_id)
+        outbox.emit('player_left', {
+            'player_id': sid,
+            'players': room_players
+        }, to=room_id, coalesce_key=('player_left', room_id))
+
+@traced('disconnect')
+def handle_disconnect(sid):
     # Remover jogador de todas as salas
-    if request.sid in connected_players:
-        player_info = connected_players[request.sid]
-        room_id = player_info.get('room_id')
-        
-        if room_id:
-            game_manager.remove_player(room_id, request.sid)
-            room_players = game_manager.get_room_players(room_id)
-            socketio.emit('player_left', {
-                'player_id': request.sid,
-                'players': room_players
-            }, room=room_id)
-        
-        del connected_players[request.sid]
-
-@socketio.on('join_room')
-def handle_join_room(data):
+    session = sessions.disconnect(sid)
+    
+    rtt_tracker.remove(sid)
+    
+    if session:
+        room_actors.post(session.room_id, process_remove_player, session.room_id, sid)
+
+def get_player_room_info(room_id, sid):
+    """
+    Estado da sala para a conexão sid. is_host diz ao cliente se ele é o host,
+    o que muda sem ele saber quando outra aba assume o jogador (ou na retomada)
+    """
+    room_info = game_manager.get_room_info(room_id)
+    room_info['is_host'] = room_info['host_id'] == sid
+    return room_info
+
+def bind_player_session(outbox, sid, room_id, player_name, player_avatar, identity):
+    """Registrar a conexão na sala e enviar o estado (jogador já adicionado à sala)"""
+    # Registrar a sessão; se estava em outra sala, sair dela (no ator da outra sala)
+    bound, previous = sessions.bind(sid, room_id, player_name, player_avatar, identity)
+    if not bound:
+        # A conexão caiu com a entrada ainda na fila: ninguém removeria o jogador
+        game_manager.remove_player(room_id, sid)
+        return
+    
+    if previous and previous.room_id != room_id:
+        transport.leave_room(sid, previous.room_id)
+        room_actors.post(previous.room_id, process_remove_player, previous.room_id, sid, False)
+    
+    # Entrar na sala do Socket.IO
+    transport.enter_room(sid, room_id)
+    
+    # Primeira medição de RTT sem esperar o próximo ciclo de sondas
+    if rtt_tracker.get(sid) is None:
+        send_rtt_probe(sid)
+    
+    # ✅ CRÍTICO: Notificar APENAS outros jogadores (skip_sid)
+    room_players = game_manager.get_room_players(room_id)
+    outbox.emit('player_joined', {
+        'player_id': sid,
+        'player_name': player_name,
+        'avatar': player_avatar,
+        'players': room_players
+    }, to=room_id, skip_sid=sid)
+    
+    # Enviar estado atual para o jogador que acabou de entrar
+    outbox.emit('room_joined', get_player_room_info(room_id, sid), to=sid)
+
+def take_over_identity_player(outbox, sid, room_id, identity):
+    """
+    Se a identidade já joga nesta sala por outra conexão (outra aba, página
+    recarregada), transferir o jogador para a nova conexão, mantendo pontuação
+    e host, e desligar a antiga da sala. Retorna True se houve transferência.
+    """
+    for other_sid in sessions.identity_sids(identity):
+        other = sessions.get(other_sid)
+        if other_sid == sid or other is None or other.room_id != room_id:
+            continue
+        if not game_manager.rekey_player(room_id, other_sid, sid):
+            continue
+        
+        sessions.pop(other_sid)
+        rtt_tracker.remove(other_sid)
+        transport.leave_room(other_sid, room_id)
+        outbox.emit('session_replaced', {
+            'message': 'Você entrou nesta sala em outra aba ou dispositivo'
+        }, to=other_sid)
+        
+        bind_player_session(outbox, sid, room_id, other.player_name, other.avatar, identity)
+        return True
+    return False
+
+def process_join_room(outbox, sid, room_id, player_name, player_avatar, identity=None):
+    """Jogador entra em uma sala (executado no ator da sala)"""
+    try:
+        # Verificar se a sala existe
+        if not game_manager.room_exists(room_id):
+            outbox.emit('error', {'message': 'Sala não encontrada'}, to=sid)
+            return
+        
+        # Conexão encerrada enquanto a entrada esperava na fila do ator
+        if not sessions.is_connected(sid):
+            return
+        
+        # ✅ CRÍTICO: Verificar se já está conectado (previne duplicação)
+        if sessions.in_room(sid, room_id):
+            # Já está na sala, apenas retornar info
+            outbox.emit('room_joined', get_player_room_info(room_id, sid), to=sid)
+            return
+        
+        # Uma identidade é um único jogador por sala
+        if identity and take_over_identity_player(outbox, sid, room_id, identity):
+            return
+        
+        # Adicionar jogador à sala com avatar
+        success = game_manager.add_player(room_id, sid, player_name, player_avatar)
+        
+        if not success:
+            outbox.emit('error', {'message': 'Não foi possível entrar na sala'}, to=sid)
+            return
+        
+        bind_player_session(outbox, sid, room_id, player_name, player_avatar, identity)
+        
+    except Exception as e:
+        print(f"Erro em join_room: {str(e)}")
+        outbox.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
+
+@traced('join_room')
+def handle_join_room(sid, data):
     """Jogador entra em uma sala"""
     try:
         room_id = data.get('room_id')
@@ -102,197 +880,247 @@ def handle_join_room(data):
         player_avatar = data.get('avatar', '👤')
         
         if not room_id or not player_name:
-            emit('error', {'message': 'Room ID e nome do jogador são obrigatórios'})
+            transport.emit('error', {'message': 'Room ID e nome do jogador são obrigatórios'}, to=sid)
             return
         
-        # Verificar se a sala existe
-        if not game_manager.room_exists(room_id):
-            emit('error', {'message': 'Sala não encontrada'})
+        if not isinstance(room_id, str):
+            transport.emit('error', {'message': 'Sala não encontrada'}, to=sid)
             return
         
-        # ✅ CRÍTICO: Verificar se já está conectado (previne duplicação)
-        if request.sid in connected_players:
-            player_info = connected_players[request.sid]
-            if player_info.get('room_id') == room_id:
-                # Já está na sala, apenas retornar info
-                room_info = game_manager.get_room_info(room_id)
-                emit('room_joined', room_info)
-                return
-            else:
-                # Está em outra sala, remover primeiro
-                old_room = player_info.get('room_id')
-                game_manager.remove_player(old_room, request.sid)
+        if drain_state['draining']:
+            transport.emit('error', {'message': 'Servidor reiniciando, tente novamente em instantes'}, to=sid)
+            return
         
-        # Adicionar jogador à sala com avatar
-        success = game_manager.add_player(room_id, request.sid, player_name, player_avatar)
+        # Identidade estável do cliente (mesma em todas as abas), opcional
+        identity = normalize_identity(data.get('client_id'))
         
-        if not success:
-            emit('error', {'message': 'Não foi possível entrar na sala'})
+        room_actors.post(room_id, process_join_room, sid, room_id, player_name, player_avatar, identity)
+        
+    except Exception as e:
+        print(f"Erro em join_room: {str(e)}")
+        transport.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
+
+def process_resume_session(outbox, sid, entry):
+    """Retomar sessão migrada de outro processo (executado no ator da sala)"""
+    try:
+        room_id = entry['room_id']
+        if not game_manager.rekey_player(room_id, entry['old_sid'], sid):
+            outbox.emit('error', {'message': 'Sessão não encontrada'}, to=sid)
             return
         
-        # Armazenar informações do jogador
-        connected_players[request.sid] = {
-            'room_id': room_id,
-            'player_name': player_name,
-            'avatar': player_avatar
-        }
+        if sessions.restore([Session.from_dict(sid, dict(entry['player_info'], room_id=room_id))]):
+            # A conexão caiu antes da retomada: o jogador já foi transferido para ela
+            game_manager.remove_player(room_id, sid)
+            return
         
-        # Entrar na sala do Socket.IO
-        join_room(room_id)
+        transport.enter_room(sid, room_id)
+        send_rtt_probe(sid)
         
-        # ✅ CRÍTICO: Notificar APENAS outros jogadores (skip_sid)
+        # Atualizar lista de jogadores (IDs mudaram) para os demais
         room_players = game_manager.get_room_players(room_id)
-        socketio.emit('player_joined', {
-            'player_id': request.sid,
-            'player_name': player_name,
-            'avatar': player_avatar,
+        outbox.emit('player_joined', {
+            'player_id': sid,
+            'player_name': entry['player_info'].get('player_name'),
+            'avatar': entry['player_info'].get('avatar'),
             'players': room_players
-        }, room=room_id, skip_sid=request.sid)
-        
-        # Enviar estado atual para o jogador que acabou de entrar
-        room_info = game_manager.get_room_info(room_id)
-        emit('room_joined', room_info)
+        }, to=room_id, skip_sid=sid)
         
+        room_info = get_player_room_info(room_id, sid)
+        room_info['player_id'] = sid
+        outbox.emit('session_resumed', room_info, to=sid)
     except Exception as e:
-        print(f"Erro em join_room: {str(e)}")
-        emit('error', {'message': 'Erro interno do servidor'})
+        print(f"Erro em resume_session: {str(e)}")
+        outbox.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
 
-@socketio.on('start_game')
-def handle_start_game(data):
-    """Iniciar o jogo"""
+@traced('resume_session')
+def handle_resume_session(sid, data):
+    """Cliente reconecta após migração e retoma exatamente onde estava"""
     try:
-        room_id = data.get('room_id')
+        token = data.get('resume_token')
+        entry = resume_registry.pop(token) if isinstance(token, str) else None
         
-        if request.sid not in connected_players:
-            emit('error', {'message': 'Jogador não encontrado'})
+        if not entry:
+            transport.emit('error', {'message': 'Sessão expirada ou inválida'}, to=sid)
             return
         
-        player_info = connected_players[request.sid]
-        if player_info.get('room_id') != room_id:
-            emit('error', {'message': 'Jogador não está nesta sala'})
+        room_actors.post(entry['room_id'], process_resume_session, sid, entry)
+    except Exception as e:
+        transport.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
+
+def check_player_in_room(outbox, sid, room_id):
+    """Verificar se o jogador está conectado à sala; emite erro caso contrário"""
+    session = sessions.get(sid)
+    
+    if not session:
+        outbox.emit('error', {'message': 'Jogador não encontrado'}, to=sid)
+        return False
+    
+    if session.room_id != room_id:
+        outbox.emit('error', {'message': 'Jogador não está nesta sala'}, to=sid)
+        return False
+    
+    return True
+
+def post_room_event(sid, data, handler, *args):
+    """Enfileirar evento de jogo no ator da sala indicada no payload"""
+    room_id = data.get('room_id')
+    if not isinstance(room_id, str):
+        transport.emit('error', {'message': 'Jogador não está nesta sala'}, to=sid)
+        return
+    
+    room_actors.post(room_id, handler, sid, room_id, data, *args)
+
+def process_start_game(outbox, sid, room_id, data):
+    """Iniciar o jogo (executado no ator da sala)"""
+    try:
+        if not check_player_in_room(outbox, sid, room_id):
             return
         
         # Verificar se o jogador é o host
-        if not game_manager.is_host(room_id, request.sid):
-            emit('error', {'message': 'Apenas o host pode iniciar o jogo'})
+        if not game_manager.is_host(room_id, sid):
+            outbox.emit('error', {'message': 'Apenas o host pode iniciar o jogo'}, to=sid)
+            return
+        
+        if game_manager.is_tournament_room(room_id):
+            outbox.emit('error', {'message': 'As rodadas do torneio são controladas pelo organizador'}, to=sid)
             return
         
         # Iniciar o jogo
         success = game_manager.start_game(room_id)
         
         if not success:
-            emit('error', {'message': 'Não foi possível iniciar o jogo'})
+            outbox.emit('error', {'message': 'Não foi possível iniciar o jogo'}, to=sid)
             return
         
         # Notificar todos os jogadores
-        socketio.emit('game_started', {
+        outbox.emit('game_started', {
             'message': 'O jogo começou!'
-        }, room=room_id)
+        }, to=room_id)
         
         # Enviar primeiro desafio
         challenge = game_manager.get_current_challenge(room_id)
         if challenge:
-            socketio.emit('new_challenge', challenge, room=room_id)
+            outbox.emit('new_challenge', challenge, to=room_id)
     except Exception as e:
-        emit('error', {'message': str(e)})
+        outbox.emit('error', {'message': str(e)}, to=sid)
 
-@socketio.on('submit_answer')
-def handle_submit_answer(data):
-    """Jogador submete uma resposta"""
+@traced('start_game')
+def handle_start_game(sid, data):
+    """Iniciar o jogo"""
+    try:
+        post_room_event(sid, data, process_start_game)
+    except Exception as e:
+        transport.emit('error', {'message': str(e)}, to=sid)
+
+def process_submit_answer(outbox, sid, room_id, data, received_at):
+    """Jogador submete uma resposta (executado no ator da sala)"""
     try:
-        room_id = data.get('room_id')
         answer = data.get('answer', '').strip()
         
-        if request.sid not in connected_players:
-            emit('error', {'message': 'Jogador não encontrado'})
-            return
-        
-        player_info = connected_players[request.sid]
-        if player_info.get('room_id') != room_id:
-            emit('error', {'message': 'Jogador não está nesta sala'})
+        if not check_player_in_room(outbox, sid, room_id):
             return
         
-        is_correct, points_earned = game_manager.check_answer(room_id, request.sid, answer)
+        # Descontar o RTT da conexão do tempo de resposta (limitado para evitar abuso)
+        latency = min(rtt_tracker.get(sid) or 0.0, config.Config.RTT_COMPENSATION_MAX)
+        is_correct, points_earned = game_manager.check_answer(room_id, sid, answer, received_at, latency)
         
         # Notificar o jogador sobre sua resposta
-        emit('answer_result', {
+        outbox.emit('answer_result', {
             'correct': is_correct,
             'answer': answer,
             'points_earned': points_earned
-        })
+        }, to=sid)
         
         # Verificar se todos responderam
         if game_manager.all_players_answered(room_id):
             # Mostrar resultados da rodada
             round_results = game_manager.get_round_results(room_id)
-            socketio.emit('round_results', round_results, room=room_id)
+            outbox.emit('round_results', round_results, to=room_id)
             
     except Exception as e:
-        emit('error', {'message': 'Erro interno do servidor'})
+        outbox.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
 
-@socketio.on('next_round')
-def handle_next_round(data):
-    """Host solicita próxima rodada"""
+@traced('submit_answer')
+def handle_submit_answer(sid, data):
+    """Jogador submete uma resposta"""
     try:
-        room_id = data.get('room_id')
-        
-        if request.sid not in connected_players:
-            emit('error', {'message': 'Jogador não encontrado'})
+        # Carimbar o recebimento antes da fila do ator
+        post_room_event(sid, data, process_submit_answer, time.monotonic())
+    except Exception as e:
+        transport.emit('error', {'message': 'Erro interno do servidor'}, to=sid)
+
+def process_next_round(outbox, sid, room_id, data):
+    """Host solicita próxima rodada (executado no ator da sala)"""
+    try:
+        if not check_player_in_room(outbox, sid, room_id):
             return
         
-        player_info = connected_players[request.sid]
-        if player_info.get('room_id') != room_id:
-            emit('error', {'message': 'Jogador não está nesta sala'})
+        # Verificar se o jogador é o host
+        if not game_manager.is_host(room_id, sid):
+            outbox.emit('error', {'message': 'Apenas o host pode avançar para a próxima rodada'}, to=sid)
             return
         
-        # Verificar se o jogador é o host
-        if not game_manager.is_host(room_id, request.sid):
-            emit('error', {'message': 'Apenas o host pode avançar para a próxima rodada'})
+        if game_manager.is_tournament_room(room_id):
+            outbox.emit('error', {'message': 'As rodadas do torneio são controladas pelo organizador'}, to=sid)
             return
         
         # Verificar se há próximo desafio
         if game_manager.has_next_challenge(room_id):
             challenge = game_manager.next_challenge(room_id)
             if challenge:
-                socketio.emit('new_challenge', challenge, room=room_id)
+                outbox.emit('new_challenge', challenge, to=room_id)
             else:
-                emit('error', {'message': 'Erro ao carregar próximo desafio'})
+                outbox.emit('error', {'message': 'Erro ao carregar próximo desafio'}, to=sid)
         else:
             # Jogo terminou
             final_results = game_manager.get_final_results(room_id)
-            socketio.emit('game_ended', final_results, room=room_id)
+            outbox.emit('game_ended', final_results, to=room_id)
             
     except Exception as e:
-        emit('error', {'message': f'Erro interno: {str(e)}'})
+        outbox.emit('error', {'message': f'Erro interno: {str(e)}'}, to=sid)
 
-@socketio.on('get_scoreboard')
-def handle_get_scoreboard(data):
-    """Obter placar atual"""
+@traced('next_round')
+def handle_next_round(sid, data):
+    """Host solicita próxima rodada"""
     try:
-        room_id = data.get('room_id')
-        
-        if request.sid not in connected_players:
-            emit('error', {'message': 'Jogador não encontrado'})
+        post_room_event(sid, data, process_next_round)
+    except Exception as e:
+        transport.emit('error', {'message': f'Erro interno: {str(e)}'}, to=sid)
+
+def process_get_scoreboard(outbox, sid, room_id, data):
+    """Obter placar atual (executado no ator da sala)"""
+    try:
+        if sid not in sessions:
+            outbox.emit('error', {'message': 'Jogador não encontrado'}, to=sid)
             return
         
         scoreboard = game_manager.get_scoreboard(room_id)
-        emit('scoreboard_update', scoreboard)
+        outbox.emit('scoreboard_update', scoreboard, to=sid)
     except Exception as e:
-        emit('error', {'message': str(e)})
+        outbox.emit('error', {'message': str(e)}, to=sid)
 
-@socketio.on('reset_game')
-def handle_reset_game(data):
-    """Host reseta o jogo para nova partida"""
+@traced('get_scoreboard')
+def handle_get_scoreboard(sid, data):
+    """Obter placar atual"""
     try:
-        room_id = data.get('room_id')
-        
-        if request.sid not in connected_players:
-            emit('error', {'message': 'Jogador não encontrado'})
+        post_room_event(sid, data, process_get_scoreboard)
+    except Exception as e:
+        transport.emit('error', {'message': str(e)}, to=sid)
+
+def process_reset_game(outbox, sid, room_id, data):
+    """Host reseta o jogo para nova partida (executado no ator da sala)"""
+    try:
+        if sid not in sessions:
+            outbox.emit('error', {'message': 'Jogador não encontrado'}, to=sid)
             return
         
         # Verificar se é o host
-        if not game_manager.is_host(room_id, request.sid):
-            emit('error', {'message': 'Apenas o host pode resetar o jogo'})
+        if not game_manager.is_host(room_id, sid):
+            outbox.emit('error', {'message': 'Apenas o host pode resetar o jogo'}, to=sid)
+            return
+        
+        if game_manager.is_tournament_room(room_id):
+            outbox.emit('error', {'message': 'As rodadas do torneio são controladas pelo organizador'}, to=sid)
             return
         
         # Resetar o jogo no game manager
@@ -300,14 +1128,44 @@ def handle_reset_game(data):
         
         if success:
             # Notificar todos os jogadores que o jogo foi resetado
-            socketio.emit('game_reset', {
+            outbox.emit('game_reset', {
                 'message': 'O host iniciou uma nova partida!'
-            }, room=room_id)
+            }, to=room_id)
         else:
-            emit('error', {'message': 'Erro ao resetar o jogo'})
+            outbox.emit('error', {'message': 'Erro ao resetar o jogo'}, to=sid)
             
     except Exception as e:
-        emit('error', {'message': f'Erro: {str(e)}'})
+        outbox.emit('error', {'message': f'Erro: {str(e)}'}, to=sid)
+
+@traced('reset_game')
+def handle_reset_game(sid, data):
+    """Host reseta o jogo para nova partida"""
+    try:
+        post_room_event(sid, data, process_reset_game)
+    except Exception as e:
+        transport.emit('error', {'message': f'Erro: {str(e)}'}, to=sid)
+
+# Eventos do cliente e seus handlers (o asgi.py registra os mesmos no AsyncServer)
+SOCKET_EVENTS = {
+    'connect': handle_connect,
+    'disconnect': handle_disconnect,
+    'join_room': handle_join_room,
+    'resume_session': handle_resume_session,
+    'start_game': handle_start_game,
+    'submit_answer': handle_submit_answer,
+    'next_round': handle_next_round,
+    'get_scoreboard': handle_get_scoreboard,
+    'reset_game': handle_reset_game
+}
+
+def register_socketio_handler(event, handler):
+    """Registrar handler no Flask-SocketIO, que informa o sid pelo request"""
+    def on_event(*args):
+        return handler(request.sid, *args)
+    socketio.on_event(event, on_event)
+
+for event, handler in SOCKET_EVENTS.items():
+    register_socketio_handler(event, handler)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
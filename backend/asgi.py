@@ -0,0 +1,93 @@
+"""
+Modo ASGI (asyncio) do servidor Party Challenges.
+
+Alternativa ao modo eventlet do app.py: o Socket.IO roda sobre
+socketio.AsyncServer e as rotas REST do Flask são montadas via WsgiToAsgi.
+Os handlers dos eventos são os mesmos do app.py (SOCKET_EVENTS), com atores
+das salas, sondas de RTT, drain, retomada de sessão e trace de eventos.
+
+Executar com:
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+"""
+import asyncio
+import contextvars
+import os
+
+# O app Flask é servido pelo adaptador WSGI; o Socket.IO do Flask não é usado
+# neste modo, então evitamos carregar o eventlet
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'threading')
+
+import socketio
+from asgiref.wsgi import WsgiToAsgi
+
+import config
+from app import app as flask_app, SOCKET_EVENTS, use_transport
+from utils.transport import AsyncServerTransport
+
+# Configurar Socket.IO assíncrono
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins='*',
+    logger=config.Config.SOCKETIO_VERBOSE_LOGS,
+    engineio_logger=config.Config.SOCKETIO_VERBOSE_LOGS,
+    ping_timeout=config.Config.SOCKETIO_PING_TIMEOUT,
+    ping_interval=config.Config.SOCKETIO_PING_INTERVAL
+)
+
+# Atores das salas, torneios e tarefas em segundo plano do app enviam pelo
+# AsyncServer, que é quem mantém as conexões neste modo
+transport = AsyncServerTransport(sio)
+use_transport(transport)
+
+
+
+def isolate_send_context(asgi_app):
+    """
+    Enviar cada mensagem HTTP em um contexto novo. O WsgiToAsgi chama send
+    no contexto da thread WSGI, que aponta para o executor do asgiref daquela
+    requisição; em conexões keep-alive o uvicorn inicia a próxima requisição
+    dentro desse send, e ela herdava o executor já encerrado (500 com
+    "CurrentThreadExecutor already quit or is broken")
+    """
+    async def app(scope, receive, send):
+        async def isolated_send(message):
+            await contextvars.Context().run(asyncio.ensure_future, send(message))
+        await asgi_app(scope, receive, isolated_send)
+    return app
+
+
+app = socketio.ASGIApp(
+    sio,
+    other_asgi_app=isolate_send_context(WsgiToAsgi(flask_app)),
+    on_startup=transport.start
+)
+
+
+def register_handler(event, handler):
+    """
+    Registrar no AsyncServer um handler do app.py. Os handlers só validam e
+    enfileiram nos atores, então rodam direto no event loop
+    """
+    if event == 'connect':
+        async def on_connect(sid, environ, auth=None):
+            handler(sid, auth)
+        sio.on(event, on_connect)
+    elif event == 'disconnect':
+        async def on_disconnect(sid):
+            handler(sid)
+        sio.on(event, on_disconnect)
+    else:
+        async def on_event(sid, *args):
+            handler(sid, *args)
+        sio.on(event, on_event)
+
+
+for event, handler in SOCKET_EVENTS.items():
+    register_handler(event, handler)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
@@ -0,0 +1,190 @@
+"""
+Microbenchmarks dos caminhos quentes de models.py e utils/game_manager.py.
+
+Sem rede nem Socket.IO: mede diretamente
+  - GameRoom.submit_answer / all_players_answered / get_round_results /
+    get_scoreboard, para salas de vários tamanhos;
+  - Challenge.check_answer para cada tipo de desafio;
+  - GameManager.create_empty_room, para vários tamanhos de pacote.
+
+Cada caso roda em várias repetições e reporta a melhor média por chamada
+(menos ruído do que a média geral). Use --json para comparar antes/depois
+de uma refatoração.
+
+Uso:
+    python benchmarks/model_hot_paths.py
+    python benchmarks/model_hot_paths.py --sizes 2 5 10 --pools 20 200 2000 --json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from models import Challenge, GameRoom  # noqa: E402
+from utils.challenge_catalog import ChallengeCatalog  # noqa: E402
+from utils.game_manager import GameManager  # noqa: E402
+
+CHALLENGE_SAMPLES = {
+    'quiz': (
+        {'type': 'quiz', 'question': 'Capital da França?', 'answer': 'Paris', 'points': 100},
+        ['paris', '  PARIS ', 'londres']
+    ),
+    'quiz_options': (
+        {'type': 'quiz', 'question': '2 + 2?', 'answer': '4', 'options': ['3', '4', '5'], 'points': 100},
+        ['4', '1', '2', 'x']
+    ),
+    'action': (
+        {'type': 'action', 'description': 'Faça 10 polichinelos', 'points': 150},
+        ['feito']
+    ),
+    'target': (
+        {'type': 'target', 'description': 'Alvos', 'points': 200, 'config': {'targetCount': 10}},
+        ['{"score": 150, "hits": 8}', 'inválido']
+    ),
+    'memory': (
+        {'type': 'memory', 'description': 'Memória', 'points': 250, 'config': {'sequenceLength': 5}},
+        ['{"score": 200, "level": 4}']
+    ),
+    'math': (
+        {'type': 'math', 'description': 'Contas', 'points': 200, 'config': {'problemCount': 10}},
+        ['{"score": 180, "correct": 9}']
+    ),
+}
+
+
+def measure(func, number, repeat):
+    """Melhor tempo médio por chamada (segundos) entre as repetições"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def make_challenges(count):
+    kinds = list(CHALLENGE_SAMPLES)
+    return [Challenge(dict(CHALLENGE_SAMPLES[kinds[index % len(kinds)]][0], question=f'q{index}'))
+            for index in range(count)]
+
+
+def make_room(size, challenge_type='quiz'):
+    """Sala iniciada com size jogadores e desafio do tipo pedido"""
+    room = GameRoom('BENCH001')
+    for index in range(size):
+        room.add_player(f'sid-{index}', f'Jogador {index}')
+    data, answers = CHALLENGE_SAMPLES[challenge_type]
+    room.set_challenges([Challenge(data) for _ in range(3)])
+    room.start_game()
+    return room, answers
+
+
+def bench_room(size, number, repeat):
+    results = {}
+    room, answers = make_room(size)
+    player_ids = list(room.players)
+
+    def submit_round():
+        for player in room.players.values():
+            player.reset_round()
+        for index, player_id in enumerate(player_ids):
+            room.submit_answer(player_id, answers[index % len(answers)])
+
+    # submit_answer: custo por resposta (uma rodada inteira / tamanho da sala)
+    results['submit_answer'] = measure(submit_round, number, repeat) / size
+
+    submit_round()
+    results['all_players_answered'] = measure(room.all_players_answered, number, repeat)
+    results['get_round_results'] = measure(room.get_round_results, number, repeat)
+    results['get_scoreboard'] = measure(room.get_scoreboard, number, repeat)
+
+    # Pior caso de resultados: rodada de minigame (respostas em JSON)
+    minigame_room, minigame_answers = make_room(size, 'target')
+    for player_id in list(minigame_room.players):
+        minigame_room.submit_answer(player_id, minigame_answers[0])
+    results['get_round_results[target]'] = measure(minigame_room.get_round_results, number, repeat)
+    return results
+
+
+def bench_check_answer(number, repeat):
+    results = {}
+    for name, (data, answers) in CHALLENGE_SAMPLES.items():
+        challenge = Challenge(data)
+
+        def check_all():
+            for answer in answers:
+                challenge.check_answer(answer)
+
+        results[f'check_answer[{name}]'] = measure(check_all, number, repeat) / len(answers)
+    return results
+
+
+def pool_manager(directory, pool_size):
+    """GameManager com pacote padrão de pool_size desafios"""
+    challenges_file = os.path.join(directory, f'challenges_{pool_size}.json')
+    with open(challenges_file, 'w', encoding='utf-8') as file:
+        json.dump([challenge.to_state() for challenge in make_challenges(pool_size)], file)
+
+    manager = GameManager()
+    manager.catalog = ChallengeCatalog(
+        packs_dir=os.path.join(directory, 'packs'),
+        default_pack='default',
+        default_file=challenges_file
+    )
+    manager.challenges_pool  # carregar antes de medir
+    return manager
+
+
+def bench_create_room(pool_sizes, number, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for pool_size in pool_sizes:
+            manager = pool_manager(directory, pool_size)
+            counter = iter(range(10 ** 9))
+
+            def create():
+                room_id = f'R{next(counter):07d}'
+                manager.create_empty_room(room_id)
+                del manager.rooms[room_id]
+
+            results[f'create_empty_room[pool={pool_size}]'] = measure(create, number, repeat)
+    return results
+
+
+def main(args):
+    random.seed(args.seed)
+    report = {}
+
+    for size in args.sizes:
+        for name, value in bench_room(size, args.number, args.repeat).items():
+            report[f'{name}[players={size}]'] = value
+    report.update(bench_check_answer(args.number, args.repeat))
+    report.update(bench_create_room(args.pools, args.number, args.repeat))
+
+    if args.json:
+        print(json.dumps({name: value * 1e6 for name, value in report.items()}, indent=2))
+        return
+
+    width = max(len(name) for name in report)
+    for name, value in report.items():
+        print(f'{name:<{width}}  {value * 1e6:9.2f} µs  {1 / value:12,.0f} ops/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Microbenchmarks de models/game_manager')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 5, 10],
+                        help='Tamanhos de sala (máximo 10 jogadores)')
+    parser.add_argument('--pools', type=int, nargs='+', default=[20, 200, 2000],
+                        help='Tamanhos do pacote de desafios para create_empty_room')
+    parser.add_argument('--number', type=int, default=2000, help='Chamadas por repetição')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='Saída em JSON (µs por chamada)')
+    main(parser.parse_args())
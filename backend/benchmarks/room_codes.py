@@ -0,0 +1,81 @@
+"""
+Benchmark do alocador de códigos de sala (utils/room_codes.py).
+
+Para cada quantidade de códigos vivos mede:
+  - alloc: throughput de allocate() até atingir N códigos vivos;
+  - churn: release() + allocate() com N códigos vivos (reuso imediato,
+    reuse_delay=0), o caso de salas sendo encerradas e criadas;
+  - memória por código vivo (tracemalloc, em uma passada separada);
+e confere que todos os códigos são únicos e aceitos por validate_room_id.
+
+Uso:
+    python benchmarks/room_codes.py --live 100000 1000000 3000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.auth import validate_room_id  # noqa: E402
+from utils.room_codes import RoomCodeAllocator  # noqa: E402
+
+
+def bench_throughput(live, churn_ops):
+    allocator = RoomCodeAllocator(reuse_delay=0)
+
+    started = time.perf_counter()
+    codes = [allocator.allocate() for _ in range(live)]
+    alloc_time = time.perf_counter() - started
+
+    assert len(set(codes)) == live, 'códigos duplicados'
+    assert len(allocator) == live
+    for code in random.sample(codes, min(1000, live)):
+        assert validate_room_id(code) == (True, code), code
+
+    started = time.perf_counter()
+    for _ in range(churn_ops):
+        index = random.randrange(live)
+        allocator.release(codes[index])
+        codes[index] = allocator.allocate()
+    churn_time = time.perf_counter() - started
+
+    assert len(allocator) == live
+    return live / alloc_time, churn_ops / churn_time
+
+
+def bench_memory(live):
+    gc.collect()
+    tracemalloc.start()
+    allocator = RoomCodeAllocator()
+    for _ in range(live):
+        allocator.allocate()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main(args):
+    random.seed(args.seed)
+    print(f"{'vivos':>10}  {'alloc/s':>10}  {'churn/s':>10}  {'memória':>10}  {'bytes/código':>12}")
+    for live in args.live:
+        alloc_rate, churn_rate = bench_throughput(live, args.churn)
+        memory = bench_memory(live) if not args.skip_memory else None
+        memory_text = f'{memory / 2 ** 20:8.1f}MB' if memory is not None else '-'
+        per_code = f'{memory / live:12.1f}' if memory is not None else '-'
+        print(f'{live:>10,}  {alloc_rate:>10,.0f}  {churn_rate:>10,.0f}  {memory_text:>10}  {per_code:>12}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark do alocador de códigos de sala')
+    parser.add_argument('--live', type=int, nargs='+', default=[100000, 1000000],
+                        help='Quantidades de códigos vivos')
+    parser.add_argument('--churn', type=int, default=100000, help='Operações release+allocate')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip-memory', action='store_true', help='Pular a medição de memória (lenta)')
+    main(parser.parse_args())
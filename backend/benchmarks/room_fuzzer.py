@@ -0,0 +1,346 @@
+"""
+Fuzzer de máquina de estados para GameManager/GameRoom.
+
+Gera sequências aleatórias (reprodutíveis pela seed) de operações sobre
+várias salas, na mesma ordem de chamadas que os handlers do app fazem:
+criar sala, entrar, reentrar, sair (com troca de host), iniciar, responder,
+próxima rodada, resetar, trocar o ID do jogador (retomada de sessão) e
+exportar/importar a sala (migração).
+
+Um modelo de referência simples acompanha o estado esperado e, após cada
+operação, os invariantes da sala são verificados:
+  - a sala existe enquanto tiver jogadores; ordem dos jogadores preservada;
+  - host sempre presente e igual ao primeiro jogador restante após saída;
+  - no máximo 10 jogadores; pontuações iguais às do modelo, nunca negativas;
+  - resposta repetida não pontua; flags de resposta zeradas a cada rodada;
+  - placar ordenado e resultados da rodada com todos os jogadores;
+  - version muda se e somente se a operação alterou a sala;
+  - to_state/from_state preserva o to_dict da sala.
+
+Em caso de falha imprime a seed, a operação e o histórico recente e sai com
+código 1. Ao final reporta operações por segundo (total e por tipo).
+
+Uso:
+    python benchmarks/room_fuzzer.py --ops 200000 --seed 42
+    python benchmarks/room_fuzzer.py --seeds 20 --ops 20000
+"""
+import argparse
+import collections
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.game_manager import GameManager  # noqa: E402
+
+MAX_PLAYERS = 10
+
+
+class InvariantError(AssertionError):
+    pass
+
+
+def check(condition, message):
+    if not condition:
+        raise InvariantError(message)
+
+
+class ShadowRoom:
+    """Estado esperado de uma sala"""
+
+    def __init__(self, host_id):
+        self.order = [host_id]
+        self.host_id = host_id
+        self.scores = {host_id: 0}
+        self.answered = set()
+        self.index = -1
+        self.started = False
+
+
+class RoomFuzzer:
+    def __init__(self, seed, max_rooms):
+        self.random = random.Random(seed)
+        self.manager = GameManager()
+        self.max_rooms = max_rooms
+        self.shadow = {}
+        self.ids = itertools.count()
+        self.history = collections.deque(maxlen=20)
+        self.operations = [
+            (self.op_create, 2), (self.op_join, 6), (self.op_rejoin, 1), (self.op_leave, 3),
+            (self.op_start, 2), (self.op_answer, 12), (self.op_next_round, 3), (self.op_reset, 1),
+            (self.op_rekey, 1), (self.op_migrate, 1)
+        ]
+        self.weights = [weight for _, weight in self.operations]
+
+    def new_id(self, prefix):
+        return f'{prefix}{next(self.ids)}'
+
+    def pick_room(self):
+        if not self.shadow:
+            return None
+        return self.random.choice(list(self.shadow))
+
+    def pick_player(self, room_id):
+        return self.random.choice(self.shadow[room_id].order)
+
+    # Operações: retornam (room_id, alterou_a_sala) ou None se não se aplicam
+
+    def op_create(self):
+        if len(self.shadow) >= self.max_rooms:
+            return None
+        room_id, host_id = self.new_id('R'), self.new_id('p')
+        self.manager.create_room(room_id, 'host', host_id)
+        self.shadow[room_id] = ShadowRoom(host_id)
+        return room_id, True
+
+    def op_join(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        player_id = self.new_id('p')
+        added = self.manager.add_player(room_id, player_id, 'jogador')
+        expected = len(shadow.order) < MAX_PLAYERS
+        check(added == expected, f'add_player retornou {added}, esperado {expected}')
+        if added:
+            shadow.order.append(player_id)
+            shadow.scores[player_id] = 0
+        return room_id, added
+
+    def op_rejoin(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        player_id = self.pick_player(room_id)
+        check(self.manager.add_player(room_id, player_id, 'renomeado', '🎉'), 'reentrada recusada')
+        check(self.manager.get_room(room_id).players[player_id].name == 'renomeado', 'nome não atualizado')
+        return room_id, True
+
+    def op_leave(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        player_id = self.pick_player(room_id)
+        check(self.manager.remove_player(room_id, player_id), 'remove_player falhou')
+        shadow.order.remove(player_id)
+        shadow.scores.pop(player_id)
+        shadow.answered.discard(player_id)
+        if not shadow.order:
+            del self.shadow[room_id]
+        elif shadow.host_id == player_id:
+            shadow.host_id = shadow.order[0]
+        return room_id, True
+
+    def op_start(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        started = self.manager.start_game(room_id)
+        expected = len(shadow.order) >= 2
+        check(started == expected, f'start_game retornou {started} com {len(shadow.order)} jogadores')
+        if started:
+            shadow.started = True
+            shadow.index = 0
+            shadow.answered.clear()
+        return room_id, started
+
+    def random_answer(self, room):
+        challenge = room.get_current_challenge()
+        choices = ['', 'errado', '  ', '0', '1', '2', '{"score": 77}', '{quebrado']
+        if challenge is not None:
+            if challenge.answer:
+                choices += [challenge.answer, challenge.answer.upper() + ' ']
+            if challenge.type in ('target', 'memory', 'math'):
+                choices.append(json.dumps({'score': self.random.randint(0, 300)}))
+        return self.random.choice(choices)
+
+    def op_answer(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        room = self.manager.get_room(room_id)
+        player_id = self.pick_player(room_id)
+        answer = self.random_answer(room)
+        challenge = room.get_current_challenge()
+
+        is_correct, points = self.manager.check_answer(room_id, player_id, answer, time.monotonic())
+
+        if player_id in shadow.answered:
+            check((is_correct, points) == (False, 0), 'resposta repetida pontuou')
+            return room_id, False
+
+        expected_correct, expected_points = (False, 0)
+        if challenge is not None:
+            expected_correct, expected_points = challenge.check_answer(answer)
+            # Resposta imediata: sempre dentro da janela do bônus de velocidade
+            if challenge.type == 'quiz' and expected_correct:
+                expected_points += 50
+        check((is_correct, points) == (expected_correct, expected_points),
+              f'resposta {answer!r}: {(is_correct, points)} != {(expected_correct, expected_points)}')
+
+        shadow.answered.add(player_id)
+        if points > 0:
+            shadow.scores[player_id] += points
+        return room_id, True
+
+    def op_next_round(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        room = self.manager.get_room(room_id)
+        if not shadow.started:
+            return room_id, False
+
+        if self.manager.has_next_challenge(room_id):
+            check(self.manager.next_challenge(room_id) is not None, 'next_challenge sem desafio')
+            shadow.index += 1
+            shadow.answered.clear()
+            return room_id, True
+
+        final = self.manager.get_final_results(room_id)
+        check(final['winner']['score'] == max(shadow.scores.values()), 'vencedor sem a maior pontuação')
+        check(final['game_summary']['total_rounds'] == len(room.challenges), 'total de rodadas incorreto')
+        return room_id, False
+
+    def op_reset(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        check(self.manager.reset_game(room_id), 'reset_game falhou')
+        shadow.scores = dict.fromkeys(shadow.order, 0)
+        shadow.answered.clear()
+        shadow.index = -1
+        shadow.started = False
+        return room_id, True
+
+    def op_rekey(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        shadow = self.shadow[room_id]
+        old_id, new_id = self.pick_player(room_id), self.new_id('p')
+        check(self.manager.rekey_player(room_id, old_id, new_id), 'rekey_player falhou')
+        shadow.order[shadow.order.index(old_id)] = new_id
+        shadow.scores[new_id] = shadow.scores.pop(old_id)
+        if old_id in shadow.answered:
+            shadow.answered.remove(old_id)
+            shadow.answered.add(new_id)
+        if shadow.host_id == old_id:
+            shadow.host_id = new_id
+        return room_id, True
+
+    def op_migrate(self):
+        room_id = self.pick_room()
+        if room_id is None:
+            return None
+        before = self.manager.get_room(room_id).to_dict()
+        state = json.loads(json.dumps(self.manager.export_room(room_id)))
+        check(not self.manager.room_exists(room_id), 'export_room não removeu a sala')
+        check(self.manager.import_room(state), 'import_room falhou')
+        check(self.manager.get_room(room_id).to_dict() == before, 'to_dict mudou após migração')
+        return room_id, True
+
+    def verify(self, room_id, version_before, mutated):
+        shadow = self.shadow.get(room_id)
+        room = self.manager.get_room(room_id)
+        if shadow is None:
+            check(room is None, 'sala vazia não foi removida')
+            return
+
+        check(room is not None, 'sala com jogadores desapareceu')
+        check(list(room.players) == shadow.order, f'ordem dos jogadores {list(room.players)} != {shadow.order}')
+        check(room.host_id == shadow.host_id and room.host_id in room.players,
+              f'host {room.host_id} != {shadow.host_id}')
+        check(len(room.players) <= MAX_PLAYERS, 'sala acima do limite de jogadores')
+        check(room.current_challenge_index == shadow.index,
+              f'rodada {room.current_challenge_index} != {shadow.index}')
+        check(-1 <= room.current_challenge_index < max(1, len(room.challenges)), 'índice de rodada fora do intervalo')
+
+        for player_id, player in room.players.items():
+            check(player.id == player_id, 'ID do jogador diferente da chave')
+            check(player.score == shadow.scores[player_id] >= 0,
+                  f'pontuação de {player_id}: {player.score} != {shadow.scores[player_id]}')
+            check(player.answered_current_round == (player_id in shadow.answered),
+                  f'flag de resposta de {player_id} incorreta')
+
+        check(room.all_players_answered() == (set(shadow.order) <= shadow.answered), 'all_players_answered incorreto')
+
+        scoreboard = room.get_scoreboard()
+        scores = [entry['score'] for entry in scoreboard]
+        check(scores == sorted(scores, reverse=True), 'placar fora de ordem')
+        check({entry['id'] for entry in scoreboard} == set(shadow.order), 'placar sem todos os jogadores')
+
+        results = room.get_round_results()
+        check([entry['player_id'] for entry in results['players_results']] == shadow.order,
+              'resultados da rodada sem todos os jogadores')
+
+        changed = room.version != version_before
+        check(changed == mutated, f'version mudou={changed}, mas a operação alterou={mutated}')
+
+    def run(self, ops):
+        counts = collections.Counter()
+        for step in range(ops):
+            operation = self.random.choices(self.operations, self.weights)[0][0]
+            name = operation.__name__[3:]
+
+            # Versão antes da operação (a sala pode ser recriada na migração)
+            snapshot = {room_id: self.manager.get_room(room_id).version for room_id in self.shadow}
+            outcome = operation()
+            if outcome is None:
+                continue
+
+            room_id, mutated = outcome
+            self.history.append((step, name, room_id, mutated))
+            counts[name] += 1
+            if name == 'create':
+                continue
+            if name == 'migrate':
+                # A sala importada é um objeto novo: só a versão deve ter avançado
+                check(self.manager.get_room(room_id).version > snapshot[room_id], 'versão não avançou na migração')
+                continue
+            self.verify(room_id, snapshot[room_id], mutated)
+        return counts
+
+
+def main(args):
+    total_ops = 0
+    total_time = 0.0
+    per_op = collections.Counter()
+
+    for seed in range(args.seed, args.seed + args.seeds):
+        fuzzer = RoomFuzzer(seed, args.rooms)
+        started = time.perf_counter()
+        try:
+            counts = fuzzer.run(args.ops)
+        except InvariantError as error:
+            print(f'FALHA (seed={seed}): {error}')
+            for step, name, room_id, mutated in fuzzer.history:
+                print(f'  #{step} {name} sala={room_id} alterou={mutated}')
+            sys.exit(1)
+        total_time += time.perf_counter() - started
+        total_ops += sum(counts.values())
+        per_op.update(counts)
+
+    print(f'seeds: {args.seeds} (a partir de {args.seed})  operações: {total_ops}  '
+          f'tempo: {total_time:.2f}s  {total_ops / total_time:,.0f} ops/s (com verificação de invariantes)')
+    for name, count in per_op.most_common():
+        print(f'  {name:<12} {count:>9}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fuzzer de máquina de estados das salas')
+    parser.add_argument('--ops', type=int, default=50000, help='Operações por seed')
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1, help='Primeira seed')
+    parser.add_argument('--rooms', type=int, default=20, help='Máximo de salas simultâneas')
+    main(parser.parse_args())
@@ -0,0 +1,231 @@
+"""
+Teste/benchmark de migração de salas entre dois processos locais.
+
+Sobe dois workers (gunicorn + eventlet), povoa o primeiro com salas em meio de
+rodada (sintéticas via /internal/migrate, mais algumas com clientes Socket.IO
+reais), faz o drain para o segundo e verifica que:
+  - todas as salas chegaram ao sucessor com a mesma rodada;
+  - os clientes reais retomam a sessão e concluem a rodada em andamento.
+
+Reporta a pausa de cada sala (congelamento -> confirmação do sucessor) e a
+pausa vista pelos clientes (server_migrating -> session_resumed).
+
+Uso:
+    python benchmarks/room_migration.py --rooms 1000 --live-rooms 5
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+import socketio
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from models import Challenge, GameRoom  # noqa: E402
+from utils.migration import MIGRATION_SECRET_HEADER  # noqa: E402
+
+SECRET = 'benchmark-migration-secret'
+
+
+def start_worker(port):
+    env = dict(os.environ, MIGRATION_SECRET=SECRET)
+    return subprocess.Popen(
+        ['gunicorn', '--worker-class', 'eventlet', '-w', '1', '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_ready(session, url):
+    for _ in range(200):
+        try:
+            async with session.get(f'{url}/healthz') as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError(f'Worker não ficou pronto: {url}')
+
+
+def synthetic_room(index):
+    """Sala com 4 jogadores no meio da segunda rodada"""
+    room = GameRoom(f'S{index:07d}')
+    for player_index in range(4):
+        room.add_player(f'sid-{index}-{player_index}', f'p{player_index}')
+    room.set_challenges([
+        Challenge({'type': 'quiz', 'question': f'q{n}', 'answer': 'a', 'points': 100})
+        for n in range(5)
+    ])
+    room.start_game()
+    room.next_challenge()
+    room.submit_answer(f'sid-{index}-0', 'a')
+    state = room.to_state()
+    state['sessions'] = {}
+    state['resume_tokens'] = {}
+    return state
+
+
+async def seed_synthetic(session, url, rooms):
+    headers = {MIGRATION_SECRET_HEADER: SECRET}
+    for start in range(0, rooms, 200):
+        batch = [synthetic_room(index) for index in range(start, min(rooms, start + 200))]
+        async with session.post(f'{url}/internal/migrate', json={'rooms': batch}, headers=headers) as response:
+            result = await response.json()
+            assert not result['rejected'], result
+
+
+class LivePlayer:
+    def __init__(self, name):
+        self.name = name
+        self.client = socketio.AsyncClient(reconnection=False)
+        self.events = asyncio.Queue()
+        self.migrating = None
+        self.pause = None
+
+        @self.client.on('*')
+        async def catch_all(event, data=None):
+            if event == 'server_migrating':
+                self.migrating = (time.perf_counter(), data)
+            await self.events.put((event, data))
+
+    async def wait_for(self, event_name, timeout=30):
+        while True:
+            name, data = await asyncio.wait_for(self.events.get(), timeout)
+            if name == event_name:
+                return data
+
+
+async def start_live_room(session, url):
+    async with session.post(f'{url}/api/create-room', json={'player_name': 'host'}) as response:
+        room_id = (await response.json())['room_id']
+
+    players = [LivePlayer('host'), LivePlayer('guest')]
+    for player in players:
+        await player.client.connect(url, transports=['websocket'])
+        await player.client.emit('join_room', {'room_id': room_id, 'player_name': player.name})
+        await player.wait_for('room_joined')
+
+    await players[0].client.emit('start_game', {'room_id': room_id})
+    for player in players:
+        await player.wait_for('new_challenge')
+
+    # Host responde antes da migração; o convidado responde depois
+    await players[0].client.emit('submit_answer', {'room_id': room_id, 'answer': 'x'})
+    await players[0].wait_for('answer_result')
+    return room_id, players
+
+
+async def resume_player(player, successor_url):
+    await player.wait_for('server_migrating')
+    _, data = player.migrating
+    await player.client.disconnect()
+    player.client = rebind(player)
+    await player.client.connect(data.get('reconnect_url') or successor_url, transports=['websocket'])
+    await player.client.emit('resume_session', {'resume_token': data['resume_token']})
+    await player.wait_for('session_resumed')
+    player.pause = time.perf_counter() - player.migrating[0]
+
+
+async def resume_live_room(room_id, players, successor_url):
+    await asyncio.gather(*[resume_player(player, successor_url) for player in players])
+
+    # Rodada continua: o host não pode responder de novo; o convidado fecha a rodada
+    await players[1].client.emit('submit_answer', {'room_id': room_id, 'answer': 'x'})
+    await players[1].wait_for('answer_result')
+    for player in players:
+        await player.wait_for('round_results')
+
+
+def rebind(player):
+    """Novo cliente Socket.IO reaproveitando a fila de eventos do jogador"""
+    client = socketio.AsyncClient(reconnection=False)
+
+    @client.on('*')
+    async def catch_all(event, data=None):
+        await player.events.put((event, data))
+
+    return client
+
+
+async def fetch_statuses(session, url, room_ids):
+    statuses = {}
+    for start in range(0, len(room_ids), 100):
+        batch = room_ids[start:start + 100]
+        async with session.post(f'{url}/api/rooms/status', json={'room_ids': batch}) as response:
+            statuses.update((await response.json())['rooms'])
+    return statuses
+
+
+async def main(args):
+    source_url = f'http://127.0.0.1:{args.port}'
+    successor_url = f'http://127.0.0.1:{args.port + 1}'
+    workers = [start_worker(args.port), start_worker(args.port + 1)]
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_ready(session, source_url)
+            await wait_ready(session, successor_url)
+
+            await seed_synthetic(session, source_url, args.rooms)
+            live_rooms = [await start_live_room(session, source_url) for _ in range(args.live_rooms)]
+            room_ids = [f'S{index:07d}' for index in range(args.rooms)] + [room_id for room_id, _ in live_rooms]
+            before = await fetch_statuses(session, source_url, room_ids)
+
+            headers = {MIGRATION_SECRET_HEADER: SECRET}
+            started = time.perf_counter()
+            async with session.post(f'{source_url}/internal/drain', headers=headers, json={
+                'successor_url': successor_url,
+                'reconnect_url': successor_url
+            }) as response:
+                assert response.status == 202, await response.text()
+
+            resumes = asyncio.gather(*[
+                resume_live_room(room_id, players, successor_url) for room_id, players in live_rooms
+            ])
+
+            while True:
+                async with session.get(f'{source_url}/internal/drain', headers=headers) as response:
+                    status = await response.json()
+                if status['done']:
+                    break
+                await asyncio.sleep(0.05)
+            drain_time = time.perf_counter() - started
+            await resumes
+
+            after = await fetch_statuses(session, successor_url, room_ids)
+            mismatched = [
+                room_id for room_id in room_ids
+                if not after[room_id]['exists']
+                or after[room_id]['current_challenge_index'] != before[room_id]['current_challenge_index']
+            ]
+
+            client_pauses = sorted(player.pause * 1000 for _, players in live_rooms for player in players)
+            print(f"salas migradas: {status['migrated']}  falhas: {status['failed']}  "
+                  f"tempo total de drain: {drain_time:.2f}s")
+            print(f"pausa por sala (servidor): {status['pause_ms']}")
+            if client_pauses:
+                print(f"pausa vista pelos clientes: p50={client_pauses[len(client_pauses) // 2]:.2f}ms "
+                      f"max={client_pauses[-1]:.2f}ms")
+            print(f"salas divergentes no sucessor: {len(mismatched)}")
+            for _, players in live_rooms:
+                for player in players:
+                    await player.client.disconnect()
+            if status['failed'] or mismatched:
+                sys.exit(1)
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de migração de salas entre processos')
+    parser.add_argument('--rooms', type=int, default=1000)
+    parser.add_argument('--live-rooms', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5201)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""
+Benchmark de carga do servidor Socket.IO (eventlet ou ASGI).
+
+Cria salas via REST, conecta jogadores, inicia o jogo e envia respostas,
+medindo a latência de join_room -> room_joined e submit_answer -> answer_result.
+
+Uso:
+    python benchmarks/socket_load.py --url http://localhost:5000 --rooms 20 --players 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+import socketio
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def wait_for(queue, event_name, timeout=10):
+    """Aguardar um evento específico na fila do cliente"""
+    while True:
+        name, data = await asyncio.wait_for(queue.get(), timeout)
+        if name == event_name:
+            return data
+
+
+async def connect_player(url, room_id, name, join_latencies):
+    client = socketio.AsyncClient(reconnection=False)
+    queue = asyncio.Queue()
+
+    @client.on('*')
+    async def catch_all(event, data=None):
+        await queue.put((event, data))
+
+    await client.connect(url, transports=['websocket'])
+    started = time.perf_counter()
+    await client.emit('join_room', {'room_id': room_id, 'player_name': name})
+    await wait_for(queue, 'room_joined')
+    join_latencies.append(time.perf_counter() - started)
+    return client, queue
+
+
+async def run_room(session, url, players, rounds, stats):
+    async with session.post(f'{url}/api/create-room', json={'player_name': 'bench'}) as response:
+        room_id = (await response.json())['room_id']
+
+    clients = []
+    for index in range(players):
+        clients.append(await connect_player(url, room_id, f'p{index}', stats['join']))
+
+    host, host_queue = clients[0]
+    await host.emit('start_game', {'room_id': room_id})
+    for _, queue in clients:
+        await wait_for(queue, 'new_challenge')
+
+    for round_number in range(rounds):
+        for client, queue in clients:
+            started = time.perf_counter()
+            await client.emit('submit_answer', {'room_id': room_id, 'answer': '{"score": 10}'})
+            await wait_for(queue, 'answer_result')
+            stats['answer'].append(time.perf_counter() - started)
+
+        for _, queue in clients:
+            await wait_for(queue, 'round_results')
+
+        if round_number + 1 < rounds:
+            await host.emit('next_round', {'room_id': room_id})
+            for _, queue in clients:
+                await wait_for(queue, 'new_challenge')
+
+    for client, _ in clients:
+        await client.disconnect()
+
+
+async def main(args):
+    stats = {'join': [], 'answer': []}
+    started = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*[
+            run_room(session, args.url, args.players, args.rounds, stats)
+            for _ in range(args.rooms)
+        ])
+    elapsed = time.perf_counter() - started
+
+    total_events = len(stats['join']) + len(stats['answer'])
+    print(f"url={args.url} rooms={args.rooms} players={args.players} rounds={args.rounds}")
+    print(f"tempo total: {elapsed:.2f}s  throughput: {total_events / elapsed:.0f} eventos/s")
+    for name, values in stats.items():
+        print(
+            f"{name:>7}: n={len(values)} "
+            f"média={statistics.mean(values) * 1000:.2f}ms "
+            f"p50={percentile(values, 50) * 1000:.2f}ms "
+            f"p95={percentile(values, 95) * 1000:.2f}ms "
+            f"p99={percentile(values, 99) * 1000:.2f}ms"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de carga Socket.IO')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--players', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=3)
+    main_args = parser.parse_args()
+    asyncio.run(main(main_args))
@@ -0,0 +1,88 @@
+"""
+Benchmark de cold start do backend.
+
+Cada amostra roda em um processo novo e mede:
+  - import: tempo para importar app.py
+  - ready: tempo até /healthz responder 200 (pacote padrão carregado)
+  - pack_json / pack_cache: carga do pacote padrão a partir do JSON e do
+    cache pré-compilado
+
+Uso:
+    python benchmarks/startup_time.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, os, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+client = app.app.test_client()
+while client.get('/healthz').status_code != 200:
+    app.socketio.sleep(0.001)
+ready = time.perf_counter()
+
+import config
+from utils.challenge_catalog import ChallengeCatalog
+
+def load_default(cache_dir):
+    catalog = ChallengeCatalog(
+        packs_dir=config.Config.CHALLENGE_PACKS_DIR,
+        default_pack=config.Config.DEFAULT_CHALLENGE_PACK,
+        default_file=config.Config.CHALLENGES_FILE,
+        cache_dir=cache_dir
+    )
+    begin = time.perf_counter()
+    catalog.get_pack()
+    return time.perf_counter() - begin
+
+pack_json = load_default(None)
+pack_cache = load_default(config.Config.CHALLENGE_CACHE_DIR)
+
+print(json.dumps({
+    'import': imported - started,
+    'ready': ready - started,
+    'pack_json': pack_json,
+    'pack_cache': pack_cache
+}))
+'''
+
+
+def run_probe(env):
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main(args):
+    env = dict(os.environ)
+    # Gerar o cache pré-compilado antes das medições, como no build
+    subprocess.check_call([sys.executable, '-m', 'utils.challenge_catalog'], cwd=BACKEND_DIR,
+                          env=env, stdout=subprocess.DEVNULL)
+
+    samples = [run_probe(env) for _ in range(args.runs)]
+    print(f"amostras: {args.runs}")
+    for key in ('import', 'ready', 'pack_json', 'pack_cache'):
+        values = [sample[key] * 1000 for sample in samples]
+        print(
+            f"{key:>10}: média={statistics.mean(values):.2f}ms "
+            f"min={min(values):.2f}ms max={max(values):.2f}ms"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de cold start')
+    parser.add_argument('--runs', type=int, default=10)
+    main(parser.parse_args())
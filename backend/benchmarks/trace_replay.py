@@ -0,0 +1,285 @@
+"""
+Replay offline de um trace de eventos gravado pelo servidor (EVENT_TRACE_FILE).
+
+Reproduz os eventos contra o app.socketio local, no mesmo processo (modo
+'threading', clientes de teste do Flask-SocketIO), respeitando os intervalos
+gravados divididos por --speed. Cada conexão do trace vira um cliente de teste
+e cada sala do trace uma sala nova do pacote padrão. Os payloads são montados
+a partir da forma gravada: strings com o mesmo tamanho, respostas de minigame
+como JSON e client_id estável por conexão (os valores reais não são gravados,
+então respostas de quiz contam como erradas e resume_session sempre expira).
+
+Para cada tipo de evento reporta a latência (envio até o fim do processamento,
+incluindo o handler no ator da sala; as emissões do lote não entram) e o tempo
+de CPU (handler do Socket.IO + handler no ator, por thread_time). O atraso de
+agendamento mostra quando o replay não conseguiu manter o ritmo pedido.
+
+Gravação e replay:
+    EVENT_TRACE_FILE=/tmp/events.trace gunicorn --worker-class eventlet -w 1 app:app
+    python benchmarks/trace_replay.py /tmp/events.trace --speed 10
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# O replay não grava um novo trace nem mistura estatísticas com as de produção
+os.environ['SOCKETIO_ASYNC_MODE'] = 'threading'
+os.environ.pop('EVENT_TRACE_FILE', None)
+os.environ['CHALLENGE_STATS_FILE'] = os.path.join(tempfile.mkdtemp(), 'challenge_stats.json')
+
+from utils.event_trace import read_trace  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Probe:
+    """Medição de um evento reproduzido; termina quando o handler síncrono e os atores terminam"""
+
+    def __init__(self, event):
+        self.event = event
+        self.started = time.perf_counter()
+        self.finished = None
+        self.cpu = 0.0
+        self.pending = 1  # o handler do Socket.IO
+        self.lock = threading.Lock()
+
+    def add_cpu(self, seconds):
+        with self.lock:
+            self.cpu += seconds
+
+    def begin(self):
+        with self.lock:
+            self.pending += 1
+
+    def done(self, *args):
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0:
+                self.finished = time.perf_counter()
+
+
+def instrument_actors(room_actors, current):
+    """Atribuir ao evento em reprodução o trabalho que ele enfileira nos atores"""
+    original_post = room_actors.post
+
+    def post(room_id, handler, *args):
+        probe = getattr(current, 'probe', None)
+        if probe is None:
+            return original_post(room_id, handler, *args)
+
+        def measured(outbox, *handler_args):
+            started = time.thread_time()
+            try:
+                return handler(outbox, *handler_args)
+            finally:
+                probe.add_cpu(time.thread_time() - started)
+
+        probe.begin()
+        future = original_post(room_id, measured, *args)
+        future.add_done_callback(probe.done)
+        return future
+
+    room_actors.post = post
+
+
+def synthesize_value(shape):
+    if not isinstance(shape, str) or not shape:
+        return {}
+    kind, size = shape[0], shape[1:]
+    if kind == 's':
+        return 'x' * int(size or 0)
+    if kind == 'j':
+        return '{"score": 0}'
+    if kind == 'n':
+        return 0
+    if kind == 'b':
+        return False
+    if kind == 'l':
+        return [0] * int(size or 0)
+    if kind == 'z':
+        return None
+    return {}
+
+
+def synthesize_payload(shape, room_id, connection):
+    """Payload com a mesma forma do gravado (room_id trocado pela sala do replay)"""
+    if shape is None and room_id is None:
+        return None
+    if shape is not None and not isinstance(shape, dict):
+        return synthesize_value(shape)
+
+    payload = {}
+    for key, value_shape in (shape or {}).items():
+        if key == 'client_id' and isinstance(value_shape, str) and value_shape.startswith('s'):
+            payload[key] = f'replay-{connection[0]}-{connection[1]}'
+        else:
+            payload[key] = synthesize_value(value_shape)
+    if room_id is not None:
+        payload['room_id'] = room_id
+    return payload
+
+
+class Replayer:
+    def __init__(self, server):
+        self.server = server
+        self.clients = {}
+        self.rooms = {}
+        self.current = threading.local()
+        instrument_actors(server.room_actors, self.current)
+
+    def room_for(self, traced_room):
+        """Sala do replay correspondente à sala do trace (criada no primeiro uso)"""
+        if traced_room is None:
+            return None
+        room_id = self.rooms.get(traced_room)
+        if room_id is None:
+            room_id = self.server.game_manager.room_codes.allocate()
+            self.server.game_manager.create_empty_room(room_id)
+            self.rooms[traced_room] = room_id
+        return room_id
+
+    def client_for(self, connection):
+        """Cliente da conexão; conexões abertas antes do início do trace conectam aqui"""
+        client = self.clients.get(connection)
+        if client is None:
+            client = self.clients[connection] = self.server.socketio.test_client(self.server.app)
+        return client
+
+    def dispatch(self, event, connection, traced_room, shape):
+        if event == 'connect':
+            if connection not in self.clients:
+                self.clients[connection] = self.server.socketio.test_client(self.server.app)
+            return
+        if event == 'disconnect':
+            client = self.clients.pop(connection, None)
+            if client is not None and client.is_connected():
+                client.disconnect()
+            return
+
+        payload = synthesize_payload(shape, self.rooms.get(traced_room), connection)
+        if payload is None:
+            self.clients[connection].emit(event)
+        else:
+            self.clients[connection].emit(event, payload)
+
+    def prepare(self, event, connection, traced_room):
+        """Trabalho que não faz parte do evento (conexões e salas implícitas)"""
+        if event not in ('connect', 'disconnect'):
+            self.client_for(connection)
+        self.room_for(traced_room)
+
+    def drain_received(self):
+        for client in self.clients.values():
+            client.get_received()
+
+
+def main(args):
+    import app as server  # noqa: E402
+
+    started = time.monotonic()
+    while not server.game_manager.is_ready():
+        if time.monotonic() - started > 30:
+            print('Pacote padrão não carregou em 30s')
+            sys.exit(1)
+        time.sleep(0.05)
+
+    # Handlers executados na thread do replay, para atribuir o trabalho ao evento
+    server.socketio.server.async_handlers = False
+    replayer = Replayer(server)
+
+    records = list(read_trace(args.trace))
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        print('Trace vazio')
+        return
+
+    probes = []
+    lags = []
+    first_at = records[0][0]
+    wall_started = time.perf_counter()
+    process_cpu_started = time.process_time()
+
+    for index, (at, event, connection, traced_room, shape) in enumerate(records):
+        replayer.prepare(event, connection, traced_room)
+
+        due = wall_started + (at - first_at) / args.speed
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            lags.append(-wait)
+
+        probe = Probe(event)
+        replayer.current.probe = probe
+        cpu_started = time.thread_time()
+        try:
+            replayer.dispatch(event, connection, traced_room, shape)
+        except Exception as e:
+            print(f'Erro ao reproduzir {event}: {str(e)}')
+        finally:
+            probe.add_cpu(time.thread_time() - cpu_started)
+            replayer.current.probe = None
+            probe.done()
+        probes.append(probe)
+
+        if index % 1000 == 999:
+            replayer.drain_received()
+
+    deadline = time.perf_counter() + args.timeout
+    while any(probe.finished is None for probe in probes) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+    wall = time.perf_counter() - wall_started
+    process_cpu = time.process_time() - process_cpu_started
+    unfinished = sum(1 for probe in probes if probe.finished is None)
+
+    by_event = collections.defaultdict(list)
+    for probe in probes:
+        if probe.finished is not None:
+            by_event[probe.event].append(probe)
+
+    traced_span = records[-1][0] - first_at
+    print(f'Trace: {len(records)} eventos, {len({record[2] for record in records})} conexões, '
+          f'{len(replayer.rooms)} salas, {traced_span:.1f}s gravados')
+    print(f'Replay: {wall:.2f}s a {args.speed:g}x, CPU do processo {process_cpu:.2f}s, '
+          f'{len(records) / wall:,.0f} eventos/s')
+    if lags:
+        print(f'Atraso de agendamento: {len(lags)} eventos atrasados, '
+              f'p99 {percentile(lags, 99) * 1000:.1f}ms, máx {max(lags) * 1000:.1f}ms')
+    if unfinished:
+        print(f'{unfinished} eventos não terminaram em {args.timeout}s')
+
+    print()
+    print(f"{'evento':<16} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>8} "
+          f"{'CPU µs':>8} {'CPU total s':>11}")
+    for event, event_probes in sorted(by_event.items(), key=lambda item: -len(item[1])):
+        latencies = [(probe.finished - probe.started) * 1000 for probe in event_probes]
+        cpu = [probe.cpu for probe in event_probes]
+        print(f'{event:<16} {len(event_probes):>7} {percentile(latencies, 50):>8.2f} '
+              f'{percentile(latencies, 95):>8.2f} {percentile(latencies, 99):>8.2f} {max(latencies):>8.2f} '
+              f'{sum(cpu) / len(cpu) * 1e6:>8.0f} {sum(cpu):>11.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay de trace de eventos Socket.IO')
+    parser.add_argument('trace', help='Arquivo gravado com EVENT_TRACE_FILE')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Fator de aceleração (1 = tempo real, 10 = 10x mais rápido)')
+    parser.add_argument('--limit', type=int, default=0, help='Reproduzir só os primeiros N eventos')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Segundos para aguardar os atores ao final')
+    main(parser.parse_args())
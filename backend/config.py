@@ -5,19 +5,91 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'party-challenges-secret-key-2024'
     
     # Socket.IO settings
-    SOCKETIO_ASYNC_MODE = 'eventlet'
+    # 'eventlet' (gunicorn + app.py) ou 'threading' quando o app Flask é
+    # servido pelo modo ASGI (asgi.py), que usa seu próprio servidor asyncio
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'eventlet')
+    SOCKETIO_VERBOSE_LOGS = os.environ.get('SOCKETIO_VERBOSE_LOGS', '0') == '1'
+    SOCKETIO_PING_TIMEOUT = 60
+    SOCKETIO_PING_INTERVAL = 25
     
     # Game settings
     MAX_PLAYERS_PER_ROOM = 10
     CHALLENGES_PER_GAME = 10
     ANSWER_TIME_LIMIT = 30  # segundos
     
+    # Execução por sala (atores): 'green' usa greenthreads do servidor,
+    # 'threads' distribui as salas entre ROOM_ACTOR_THREADS threads do SO.
+    # Sem eventlet (modo ASGI) as tarefas rodam em threads do SO e só o modo
+    # 'threads' serializa as leituras das rotas REST com os eventos da sala
+    ROOM_ACTOR_MODE = os.environ.get(
+        'ROOM_ACTOR_MODE', 'green' if SOCKETIO_ASYNC_MODE == 'eventlet' else 'threads'
+    )
+    ROOM_ACTOR_THREADS = int(os.environ.get('ROOM_ACTOR_THREADS', 4))
+    ROOM_ACTOR_MAX_BATCH = 32  # eventos processados por lote antes de emitir
+    
+    # Migração de salas entre processos (drain); endpoints /internal/* ficam
+    # desativados sem MIGRATION_SECRET
+    MIGRATION_SECRET = os.environ.get('MIGRATION_SECRET')
+    MIGRATION_BATCH_SIZE = 100  # salas por requisição ao sucessor
+    MIGRATION_RESUME_TTL = 120  # segundos para o cliente retomar a sessão
+    
+    # Códigos de sala: um código liberado só volta a ser usado após este tempo
+    ROOM_CODE_REUSE_DELAY = 600  # segundos
+    
+    # Pool de salas pré-montadas (desafios já sorteados) e criação em lote
+    ROOM_POOL_MIN_SIZE = 4  # salas prontas mínimas do pacote padrão
+    ROOM_POOL_MAX_SIZE = 200  # salas prontas máximas por pacote
+    ROOM_POOL_DEMAND_WINDOW = 60  # segundos de histórico de criação para o alvo
+    ROOM_POOL_REFILL_INTERVAL = 1  # segundos entre reabastecimentos
+    ROOM_POOL_REFILL_BATCH = 16  # salas montadas antes de ceder o loop
+    ROOMS_BULK_MAX = 200  # máximo de salas por POST /api/rooms/bulk
+    EMPTY_ROOM_TTL = 1800  # segundos até uma sala em que ninguém entrou ser removida
+    EMPTY_ROOM_REAP_INTERVAL = 60  # segundos entre varreduras de salas vazias
+    
+    # Torneios
+    TOURNAMENT_MAX_ROOMS = 100
+    TOURNAMENT_TOP_N = 10  # posições do ranking global enviadas às salas
+    
+    # REST API
+    ROOM_INFO_CACHE_SIZE = 512  # respostas serializadas de /api/room em cache
+    CORS_MAX_AGE = 600  # segundos que o navegador guarda o preflight
+    ROOMS_STATUS_MAX_IDS = 100  # máximo de salas por consulta em lote
+    
     # Scoring
     CORRECT_ANSWER_POINTS = 100
     SPEED_BONUS_POINTS = 50  # pontos extras para resposta rápida
     
+    # Estatísticas de respostas por desafio e sorteio balanceado por dificuldade
+    CHALLENGE_STATS_FLUSH_INTERVAL = 30  # segundos entre gravações em disco
+    BALANCED_SAMPLING = os.environ.get('BALANCED_SAMPLING', '1') == '1'
+    DIFFICULTY_MIN_ATTEMPTS = 10  # tentativas para classificar um desafio
+    DIFFICULTY_EASY_RATE = 0.75  # aproveitamento a partir do qual é fácil
+    DIFFICULTY_HARD_RATE = 0.4  # aproveitamento abaixo do qual é difícil
+    DIFFICULTY_REFRESH_INTERVAL = 30  # segundos de reuso da classificação
+    
+    # Gravação opcional dos eventos Socket.IO recebidos (replay offline com
+    # benchmarks/trace_replay.py); desativada sem EVENT_TRACE_FILE. Com vários
+    # workers use '{pid}' no caminho (ex.: /var/log/pc/events-{pid}.trace)
+    EVENT_TRACE_FILE = os.environ.get('EVENT_TRACE_FILE')
+    EVENT_TRACE_MAX_BYTES = int(os.environ.get('EVENT_TRACE_MAX_BYTES', 512 * 1024 * 1024))
+    EVENT_TRACE_FLUSH_INTERVAL = 1  # segundos entre descargas do buffer
+    
+    # Latência (RTT) por conexão, usada para compensar o bônus de velocidade
+    RTT_PROBE_INTERVAL = 5  # segundos entre sondas rtt_ping
+    RTT_COMPENSATION_MAX = 2.0  # desconto máximo de RTT por resposta (segundos)
+    
     # File paths
     CHALLENGES_FILE = os.path.join(os.path.dirname(__file__), 'quiz_data', 'challenges.json')
+    CHALLENGE_PACKS_DIR = os.path.join(os.path.dirname(__file__), 'quiz_data', 'packs')
+    CHALLENGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'quiz_data', '.cache')
+    CHALLENGE_STATS_FILE = os.environ.get('CHALLENGE_STATS_FILE') or os.path.join(
+        os.path.dirname(__file__), 'quiz_data', '.stats', 'challenge_stats.json'
+    )
+    
+    # Pacotes de desafios
+    DEFAULT_CHALLENGE_PACK = 'default'  # corresponde a CHALLENGES_FILE
+    MAX_RESIDENT_PACKS = 8  # pacotes mantidos em memória (LRU)
+    PACK_RELOAD_CHECK_INTERVAL = 2  # segundos entre verificações de mtime
     
 class DevelopmentConfig(Config):
     DEBUG = True
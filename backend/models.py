@@ -1,6 +1,13 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import hashlib
+import itertools
 import json
+import time
+
+# Contador global de versões: (room_id, version) nunca se repete, mesmo se
+# uma sala for removida e recriada com o mesmo código
+_room_versions = itertools.count(1)
 
 class Player:
     def __init__(self, player_id: str, name: str, avatar: str = None):
@@ -12,12 +19,14 @@ class Player:
         self.answered_current_round = False
         self.current_answer = None
         self.answer_time = None
+        self.reaction_time = None
     
     def reset_round(self):
         """Resetar dados da rodada atual"""
         self.answered_current_round = False
         self.current_answer = None
         self.answer_time = None
+        self.reaction_time = None
     
     def submit_answer(self, answer: str):
         """Submeter resposta para a rodada atual"""
@@ -29,6 +38,31 @@ class Player:
         """Adicionar pontos ao jogador"""
         self.score += points
     
+    def to_state(self) -> dict:
+        """Estado completo serializável (migração entre processos)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'avatar': self.avatar,
+            'score': self.score,
+            'joined_at': self.joined_at.isoformat(),
+            'answered_current_round': self.answered_current_round,
+            'current_answer': self.current_answer,
+            'answer_time': self.answer_time.isoformat() if self.answer_time else None,
+            'reaction_time': self.reaction_time
+        }
+    
+    @classmethod
+    def from_state(cls, state: dict) -> 'Player':
+        player = cls(state['id'], state['name'], state.get('avatar'))
+        player.score = state.get('score', 0)
+        player.joined_at = datetime.fromisoformat(state['joined_at'])
+        player.answered_current_round = state.get('answered_current_round', False)
+        player.current_answer = state.get('current_answer')
+        player.answer_time = datetime.fromisoformat(state['answer_time']) if state.get('answer_time') else None
+        player.reaction_time = state.get('reaction_time')
+        return player
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -49,6 +83,10 @@ class Challenge:
         self.points = challenge_data.get('points', 100)
         self.time_limit = challenge_data.get('time_limit', 30)
         self.config = challenge_data.get('config', {})
+        # Identificador estável pelo conteúdo (sobrevive a recargas do pacote)
+        self.key = hashlib.sha1(
+            f'{self.type}\0{self.question}\0{self.description}'.encode('utf-8')
+        ).hexdigest()[:16]
     
     def check_answer(self, user_answer: str) -> tuple:
         """
@@ -91,6 +129,19 @@ class Challenge:
         
         return False, 0
     
+    def to_state(self) -> dict:
+        """Dados no formato aceito pelo construtor (migração entre processos)"""
+        return {
+            'type': self.type,
+            'question': self.question,
+            'description': self.description,
+            'answer': self.answer,
+            'options': self.options,
+            'points': self.points,
+            'time_limit': self.time_limit,
+            'config': self.config
+        }
+    
     def to_dict(self):
         result = {
             'type': self.type,
@@ -121,10 +172,20 @@ class GameRoom:
         self.game_ended = False
         self.created_at = datetime.now()
         self.round_start_time = None
+        self.round_start_monotonic = None
+        self.challenge_pack = None
+        self.tournament_id = None
+        self.version = next(_room_versions)
+        # Chamado a cada resposta aceita: (challenge, is_correct, points, reaction_time)
+        self.answer_observer: Optional[Callable] = None
         
         if host_id and host_name:
             self.add_player(host_id, host_name, host_avatar)
     
+    def touch(self):
+        """Marcar estado da sala como alterado (invalida ETags e caches)"""
+        self.version = next(_room_versions)
+    
     def add_player(self, player_id: str, player_name: str, avatar: str = None) -> bool:
         """Adicionar jogador à sala"""
         if len(self.players) >= 10:
@@ -134,6 +195,7 @@ class GameRoom:
         if player_id in self.players:
             self.players[player_id].name = player_name
             self.players[player_id].avatar = avatar or '👤'
+            self.touch()
             return True
         
         # Se é o primeiro jogador, torna-se host
@@ -142,6 +204,7 @@ class GameRoom:
         
         # Adiciona novo jogador
         self.players[player_id] = Player(player_id, player_name, avatar)
+        self.touch()
         return True
     
     def remove_player(self, player_id: str) -> bool:
@@ -154,11 +217,13 @@ class GameRoom:
         if player_id == self.host_id and self.players:
             self.host_id = next(iter(self.players))
         
+        self.touch()
         return True
     
     def set_challenges(self, challenges: List[Challenge]):
         """Definir lista de desafios do jogo"""
         self.challenges = challenges
+        self.touch()
     
     def start_game(self) -> bool:
         """Iniciar o jogo"""
@@ -171,10 +236,12 @@ class GameRoom:
         self.game_started = True
         self.current_challenge_index = 0
         self.round_start_time = datetime.now()
+        self.round_start_monotonic = time.monotonic()
         
         for player in self.players.values():
             player.reset_round()
         
+        self.touch()
         return True
     
     def get_current_challenge(self) -> Optional[Challenge]:
@@ -187,15 +254,20 @@ class GameRoom:
         """Avançar para próximo desafio"""
         self.current_challenge_index += 1
         self.round_start_time = datetime.now()
+        self.round_start_monotonic = time.monotonic()
         
         for player in self.players.values():
             player.reset_round()
         
+        self.touch()
         return self.get_current_challenge()
     
-    def submit_answer(self, player_id: str, answer: str) -> tuple:
+    def submit_answer(self, player_id: str, answer: str, received_at: float = None,
+                      latency: float = 0.0) -> tuple:
         """
         Jogador submete resposta
+        received_at: time.monotonic() do recebimento no servidor
+        latency: RTT estimado da conexão, descontado do tempo de reação
         Retorna (success, points_earned)
         """
         if player_id not in self.players:
@@ -206,15 +278,25 @@ class GameRoom:
             return False, 0
         
         player.submit_answer(answer)
+        self.touch()
+        
+        # Tempo de reação estimado no cliente: tempo no servidor entre o envio do
+        # desafio e o recebimento da resposta, menos o RTT (ida + volta)
+        if self.round_start_monotonic is not None:
+            received_at = received_at if received_at is not None else time.monotonic()
+            elapsed = received_at - self.round_start_monotonic
+            player.reaction_time = max(0.0, elapsed - (latency or 0.0))
         
         current_challenge = self.get_current_challenge()
         if current_challenge:
             is_correct, points = current_challenge.check_answer(answer)
             
+            if self.answer_observer:
+                self.answer_observer(current_challenge, is_correct, points, player.reaction_time)
+            
             # Adicionar bônus por velocidade (apenas para quiz tradicional)
-            if current_challenge.type == 'quiz' and is_correct and self.round_start_time:
-                time_elapsed = (datetime.now() - self.round_start_time).total_seconds()
-                if time_elapsed <= 10:
+            if current_challenge.type == 'quiz' and is_correct and player.reaction_time is not None:
+                if player.reaction_time <= 10:
                     points += 50
             
             if points > 0:
@@ -280,6 +362,65 @@ class GameRoom:
         
         return results
     
+    def rekey_player(self, old_id: str, new_id: str) -> bool:
+        """Trocar o ID de um jogador (ex.: nova conexão após migração), mantendo a ordem"""
+        if old_id not in self.players or new_id in self.players:
+            return False
+        
+        self.players = {
+            (new_id if player_id == old_id else player_id): player
+            for player_id, player in self.players.items()
+        }
+        self.players[new_id].id = new_id
+        if self.host_id == old_id:
+            self.host_id = new_id
+        
+        self.touch()
+        return True
+    
+    def to_state(self) -> dict:
+        """Estado completo serializável (migração entre processos)"""
+        round_elapsed = None
+        if self.round_start_monotonic is not None:
+            round_elapsed = time.monotonic() - self.round_start_monotonic
+        
+        return {
+            'id': self.id,
+            'host_id': self.host_id,
+            'players': [player.to_state() for player in self.players.values()],
+            'challenges': [challenge.to_state() for challenge in self.challenges],
+            'current_challenge_index': self.current_challenge_index,
+            'game_started': self.game_started,
+            'game_ended': self.game_ended,
+            'created_at': self.created_at.isoformat(),
+            'round_start_time': self.round_start_time.isoformat() if self.round_start_time else None,
+            'round_elapsed': round_elapsed,
+            'challenge_pack': self.challenge_pack,
+            'tournament_id': self.tournament_id
+        }
+    
+    @classmethod
+    def from_state(cls, state: dict) -> 'GameRoom':
+        room = cls(state['id'])
+        room.host_id = state.get('host_id')
+        for player_state in state.get('players', []):
+            player = Player.from_state(player_state)
+            room.players[player.id] = player
+        room.challenges = [Challenge(challenge_data) for challenge_data in state.get('challenges', [])]
+        room.current_challenge_index = state.get('current_challenge_index', -1)
+        room.game_started = state.get('game_started', False)
+        room.game_ended = state.get('game_ended', False)
+        room.created_at = datetime.fromisoformat(state['created_at'])
+        if state.get('round_start_time'):
+            room.round_start_time = datetime.fromisoformat(state['round_start_time'])
+        # Tempo de rodada continua de onde parou (a pausa da migração não conta)
+        if state.get('round_elapsed') is not None:
+            room.round_start_monotonic = time.monotonic() - state['round_elapsed']
+        room.challenge_pack = state.get('challenge_pack')
+        room.tournament_id = state.get('tournament_id')
+        room.touch()
+        return room
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -290,5 +431,7 @@ class GameRoom:
             'game_ended': self.game_ended,
             'current_challenge_index': self.current_challenge_index,
             'total_challenges': len(self.challenges),
+            'challenge_pack': self.challenge_pack,
+            'tournament_id': self.tournament_id,
             'created_at': self.created_at.isoformat()
         }
\ No newline at end of file
@@ -0,0 +1,201 @@
+import json
+import marshal
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from models import Challenge
+
+PACK_NAME_PATTERN = re.compile(r'^[a-z0-9_-]{1,40}$')
+
+
+class ChallengePack:
+    """Pacote de desafios carregado em memória"""
+
+    def __init__(self, name: str, path: str, mtime: float, challenges: List[Challenge]):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.challenges = challenges
+        self.checked_at = time.monotonic()
+
+
+class ChallengeCatalog:
+    """
+    Catálogo de pacotes de desafios nomeados.
+
+    Os pacotes são carregados no primeiro uso e mantidos em um LRU limitado a
+    max_resident pacotes. A cada acesso (no máximo uma vez por check_interval
+    segundos) o mtime do arquivo é verificado; se mudou, o pacote é recarregado
+    com novos objetos Challenge. Salas já criadas mantêm a lista antiga.
+
+    Se cache_dir for informado, o conteúdo de cada pacote é guardado pré-
+    compilado (marshal) junto com o mtime/tamanho do JSON de origem, evitando
+    o parse do JSON no cold start.
+    """
+
+    def __init__(self, packs_dir: str, default_pack: str, default_file: str,
+                 max_resident: int = 8, check_interval: float = 2.0,
+                 fallback: Callable[[], List[Challenge]] = None,
+                 cache_dir: str = None):
+        self.packs_dir = packs_dir
+        self.cache_dir = cache_dir
+        self.default_pack = default_pack
+        self.default_file = default_file
+        self.max_resident = max_resident
+        self.check_interval = check_interval
+        self.fallback = fallback
+        self.packs: 'OrderedDict[str, ChallengePack]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def pack_path(self, name: str) -> Optional[str]:
+        """Caminho do arquivo de um pacote (None se o nome for inválido)"""
+        if name == self.default_pack:
+            return self.default_file
+        if not PACK_NAME_PATTERN.match(name):
+            return None
+        return os.path.join(self.packs_dir, f'{name}.json')
+
+    def list_packs(self) -> List[str]:
+        """Listar nomes dos pacotes disponíveis em disco"""
+        names = {self.default_pack}
+        try:
+            for filename in os.listdir(self.packs_dir):
+                name, extension = os.path.splitext(filename)
+                if extension == '.json' and PACK_NAME_PATTERN.match(name):
+                    names.add(name)
+        except FileNotFoundError:
+            pass
+        return sorted(names)
+
+    def pack_exists(self, name: str) -> bool:
+        """Verificar se um pacote existe"""
+        if name == self.default_pack:
+            return True
+        path = self.pack_path(name)
+        return path is not None and os.path.isfile(path)
+
+    def get_pack(self, name: str = None) -> List[Challenge]:
+        """
+        Obter desafios de um pacote, carregando ou recarregando se necessário.
+        Lança KeyError se o pacote não existir.
+        """
+        name = name or self.default_pack
+        path = self.pack_path(name)
+        if path is None:
+            raise KeyError(name)
+
+        with self.lock:
+            pack = self.packs.get(name)
+            if pack is not None:
+                self.packs.move_to_end(name)
+                now = time.monotonic()
+                if now - pack.checked_at < self.check_interval:
+                    return pack.challenges
+                pack.checked_at = now
+                if self._mtime(path) == pack.mtime:
+                    return pack.challenges
+
+            pack = self._load(name, path)
+            self.packs[name] = pack
+            self.packs.move_to_end(name)
+            while len(self.packs) > self.max_resident:
+                self.packs.popitem(last=False)
+
+            return pack.challenges
+
+    def resident_packs(self) -> Dict[str, int]:
+        """Pacotes em memória e quantidade de desafios de cada um"""
+        with self.lock:
+            return {name: len(pack.challenges) for name, pack in self.packs.items()}
+
+    def _mtime(self, path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def precompile_all(self) -> List[str]:
+        """Gerar o cache pré-compilado de todos os pacotes em disco"""
+        compiled = []
+        for name in self.list_packs():
+            path = self.pack_path(name)
+            try:
+                self._read_data(name, path)
+                compiled.append(name)
+            except (FileNotFoundError, json.JSONDecodeError):
+                print(f"Pacote ignorado: {name}")
+        return compiled
+
+    def _cache_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f'{name}.marshal')
+
+    def _read_data(self, name: str, path: str) -> list:
+        """Ler dados brutos do pacote, usando o cache pré-compilado se válido"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        if self.cache_dir:
+            try:
+                with open(self._cache_path(name), 'rb') as file:
+                    cached_key, challenges_data = marshal.loads(file.read())
+                if tuple(cached_key) == key:
+                    return challenges_data
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        with open(path, 'r', encoding='utf-8') as file:
+            challenges_data = json.load(file)
+
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temp_path = f'{self._cache_path(name)}.{os.getpid()}.tmp'
+                with open(temp_path, 'wb') as file:
+                    file.write(marshal.dumps((key, challenges_data)))
+                os.replace(temp_path, self._cache_path(name))
+            except (OSError, ValueError):
+                # Cache é apenas otimização; falhas de escrita são ignoradas
+                pass
+
+        return challenges_data
+
+    def _load(self, name: str, path: str) -> ChallengePack:
+        """Ler e converter o arquivo JSON de um pacote"""
+        mtime = self._mtime(path)
+        try:
+            challenges_data = self._read_data(name, path)
+            challenges = [Challenge(challenge_data) for challenge_data in challenges_data]
+        except FileNotFoundError:
+            if name != self.default_pack or not self.fallback:
+                raise KeyError(name)
+            print(f"Arquivo de desafios não encontrado: {path}")
+            challenges = self.fallback()
+        except json.JSONDecodeError:
+            print(f"Erro ao decodificar arquivo JSON de desafios: {path}")
+            previous = self.packs.get(name)
+            if previous is not None:
+                # Arquivo em edição: manter versão anterior até o próximo ciclo
+                previous.checked_at = time.monotonic()
+                return previous
+            if name != self.default_pack or not self.fallback:
+                raise KeyError(name)
+            challenges = self.fallback()
+
+        return ChallengePack(name, path, mtime, challenges)
+
+
+if __name__ == '__main__':
+    # Pré-compilar pacotes durante o build: python -m utils.challenge_catalog
+    import config
+
+    catalog = ChallengeCatalog(
+        packs_dir=config.Config.CHALLENGE_PACKS_DIR,
+        default_pack=config.Config.DEFAULT_CHALLENGE_PACK,
+        default_file=config.Config.CHALLENGES_FILE,
+        cache_dir=config.Config.CHALLENGE_CACHE_DIR
+    )
+    for pack_name in catalog.precompile_all():
+        print(f"Pacote pré-compilado: {pack_name}")
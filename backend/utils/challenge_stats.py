@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Limites superiores (segundos) das faixas do histograma de tempo de resposta;
+# a última faixa acumula tudo acima de 60s
+RESPONSE_TIME_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 30, 60)
+MINIGAME_TYPES = ('target', 'memory', 'math')
+
+
+class ChallengeStats:
+    """Agregados de um desafio, com memória constante (contadores + histograma fixo)"""
+
+    __slots__ = ('attempts', 'correct', 'success_total', 'time_total', 'timed', 'histogram')
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        # Soma do aproveitamento de cada tentativa (0..1): acerto no quiz,
+        # fração da pontuação máxima nos minigames
+        self.success_total = 0.0
+        self.time_total = 0.0
+        self.timed = 0
+        self.histogram = [0] * (len(RESPONSE_TIME_BUCKETS) + 1)
+
+    def record(self, correct: bool, success: float, reaction_time: Optional[float]):
+        self.attempts += 1
+        if correct:
+            self.correct += 1
+        self.success_total += success
+
+        if reaction_time is not None:
+            self.timed += 1
+            self.time_total += reaction_time
+            bucket = len(RESPONSE_TIME_BUCKETS)
+            for index, limit in enumerate(RESPONSE_TIME_BUCKETS):
+                if reaction_time <= limit:
+                    bucket = index
+                    break
+            self.histogram[bucket] += 1
+
+    def success_rate(self, prior_weight: float = 2.0, prior_rate: float = 0.5) -> float:
+        """Aproveitamento suavizado (poucas tentativas ficam perto de prior_rate)"""
+        return (self.success_total + prior_weight * prior_rate) / (self.attempts + prior_weight)
+
+    def time_percentile(self, pct: float) -> Optional[float]:
+        """Percentil aproximado do tempo de resposta (limite superior da faixa; o último limite se acima dele)"""
+        if not self.timed:
+            return None
+        target = pct / 100 * self.timed
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target and count:
+                return RESPONSE_TIME_BUCKETS[min(index, len(RESPONSE_TIME_BUCKETS) - 1)]
+        return None
+
+    def to_state(self) -> dict:
+        return {
+            'attempts': self.attempts,
+            'correct': self.correct,
+            'success_total': self.success_total,
+            'time_total': self.time_total,
+            'timed': self.timed,
+            'histogram': list(self.histogram)
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'ChallengeStats':
+        stats = cls()
+        stats.attempts = state.get('attempts', 0)
+        stats.correct = state.get('correct', 0)
+        stats.success_total = state.get('success_total', 0.0)
+        stats.time_total = state.get('time_total', 0.0)
+        stats.timed = state.get('timed', 0)
+        histogram = state.get('histogram', [])
+        if len(histogram) == len(stats.histogram):
+            stats.histogram = list(histogram)
+        return stats
+
+    def to_dict(self):
+        return {
+            'attempts': self.attempts,
+            'correct_rate': round(self.correct / self.attempts, 4) if self.attempts else None,
+            'success_rate': round(self.success_total / self.attempts, 4) if self.attempts else None,
+            'mean_response_time': round(self.time_total / self.timed, 3) if self.timed else None,
+            'p50_response_time': self.time_percentile(50),
+            'p90_response_time': self.time_percentile(90),
+            'response_time_histogram': dict(zip(
+                [f'<={limit}s' for limit in RESPONSE_TIME_BUCKETS] + [f'>{RESPONSE_TIME_BUCKETS[-1]}s'],
+                self.histogram
+            ))
+        }
+
+
+class ChallengeAnalytics:
+    """
+    Estatísticas de respostas por desafio (chave: Challenge.key), alimentadas
+    por GameRoom.submit_answer e gravadas periodicamente em disco.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.stats: Dict[str, ChallengeStats] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    def record(self, challenge, is_correct: bool, points: int, reaction_time: Optional[float]):
+        """Registrar uma resposta aceita (points sem o bônus de velocidade)"""
+        if challenge.type in MINIGAME_TYPES:
+            success = min(1.0, max(0.0, points / challenge.points)) if challenge.points else 0.0
+        else:
+            success = 1.0 if is_correct else 0.0
+
+        with self.lock:
+            stats = self.stats.get(challenge.key)
+            if stats is None:
+                stats = self.stats[challenge.key] = ChallengeStats()
+            stats.record(is_correct, success, reaction_time)
+            self.dirty = True
+
+    def get(self, key: str) -> Optional[ChallengeStats]:
+        return self.stats.get(key)
+
+    def success_rates(self, challenges: Iterable, min_attempts: int) -> List[Optional[float]]:
+        """Aproveitamento suavizado de cada desafio (None se há poucas tentativas)"""
+        with self.lock:
+            rates = []
+            for challenge in challenges:
+                stats = self.stats.get(challenge.key)
+                rates.append(stats.success_rate() if stats and stats.attempts >= min_attempts else None)
+            return rates
+
+    def load(self) -> int:
+        """Carregar estatísticas gravadas; retorna o número de desafios lidos"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao carregar estatísticas de desafios: {str(e)}")
+            return 0
+
+        with self.lock:
+            for key, state in data.get('challenges', {}).items():
+                self.stats[key] = ChallengeStats.from_state(state)
+        return len(data.get('challenges', {}))
+
+    def flush(self) -> bool:
+        """Gravar em disco se houve novas respostas (escrita atômica)"""
+        if not self.path or not self.dirty:
+            return False
+
+        with self.lock:
+            data = {'challenges': {key: stats.to_state() for key, stats in self.stats.items()}}
+            self.dirty = False
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.dirty = True
+            raise
+        return True
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+TRACE_FORMAT_VERSION = 1
+MAX_SHAPE_KEYS = 16  # chaves gravadas por payload (clientes podem mandar qualquer coisa)
+
+
+def payload_shape(data: Any) -> Any:
+    """
+    Forma do payload sem os valores (nomes, respostas e tokens não são gravados):
+      'sN'  string de N caracteres ('jN' se for um objeto JSON, ex.: minigames)
+      'n'   número, 'b' booleano, 'z' None, 'lN' lista com N itens
+      dict  mesma estrutura, um nível, com a forma de cada valor ('o' se aninhado)
+    """
+    if isinstance(data, dict):
+        keys = list(data)[:MAX_SHAPE_KEYS]
+        return {str(key)[:32]: _value_shape(data[key]) for key in keys}
+    return _value_shape(data)
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped.startswith('{') and stripped.endswith('}'):
+            return f'j{len(value)}'
+        return f's{len(value)}'
+    if isinstance(value, bool):
+        return 'b'
+    if isinstance(value, (int, float)):
+        return 'n'
+    if value is None:
+        return 'z'
+    if isinstance(value, (list, tuple)):
+        return f'l{len(value)}'
+    return 'o'
+
+
+class EventTraceRecorder:
+    """
+    Gravação opcional dos eventos Socket.IO recebidos, para replay offline
+    (benchmarks/trace_replay.py).
+
+    Arquivo só de acréscimo, uma linha JSON por registro. Cada processo abre
+    uma sessão com um cabeçalho {"trace": 1, "started_at": ...}; os eventos
+    seguintes são [ms desde o início, evento, conexão, sala, forma do payload].
+    As conexões são numeradas na ordem em que aparecem (o sid real não é
+    gravado) e o número é liberado na desconexão. A room_id do payload vai
+    para o campo sala e sai da forma. A gravação para ao atingir max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0):
+        # Com vários workers, '{pid}' no caminho separa um arquivo por processo
+        self.path = path.replace('{pid}', str(os.getpid()))
+        self.max_bytes = max_bytes
+        self.started = time.monotonic()
+        self.connections: Dict[str, int] = {}
+        self.next_connection = 0
+        self.recorded = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, 'a', encoding='utf-8', buffering=1 << 16)
+        self.written = self.file.tell()
+        self._write({'trace': TRACE_FORMAT_VERSION, 'started_at': datetime.now().isoformat()})
+
+    def _write(self, record) -> bool:
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        if self.max_bytes and self.written + len(line) > self.max_bytes:
+            return False
+        self.file.write(line)
+        self.written += len(line)
+        return True
+
+    def record(self, event: str, sid: str, data: Any = None):
+        """Registrar um evento recebido da conexão sid"""
+        elapsed = round((time.monotonic() - self.started) * 1000, 1)
+        room_id = None
+        if isinstance(data, dict) and isinstance(data.get('room_id'), str):
+            room_id = data['room_id']
+            data = {key: value for key, value in data.items() if key != 'room_id'}
+        shape = payload_shape(data) if data is not None else None
+
+        with self.lock:
+            connection = self.connections.get(sid)
+            if connection is None:
+                connection = self.connections[sid] = self.next_connection
+                self.next_connection += 1
+            if event == 'disconnect':
+                del self.connections[sid]
+
+            if self._write([elapsed, event, connection, room_id, shape]):
+                self.recorded += 1
+            else:
+                self.dropped += 1
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def stats(self) -> dict:
+        return {
+            'path': self.path,
+            'recorded': self.recorded,
+            'dropped': self.dropped,
+            'bytes': self.written
+        }
+
+
+def read_trace(path: str) -> Iterator[Tuple[float, str, Tuple[int, int], Optional[str], Any]]:
+    """
+    Ler um trace: (segundos desde o início do arquivo, evento, conexão, sala, forma).
+    Sessões gravadas em sequência são concatenadas na linha do tempo, e a
+    conexão é identificada por (sessão, número) porque a numeração recomeça
+    a cada sessão.
+    """
+    session = -1
+    offset = 0.0
+    last = 0.0
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Última linha truncada (processo encerrado durante a escrita)
+                continue
+
+            if isinstance(record, dict):
+                session += 1
+                offset = last
+                continue
+
+            elapsed, event, connection, room_id, shape = record
+            last = offset + elapsed / 1000
+            yield last, event, (session, connection), room_id, shape
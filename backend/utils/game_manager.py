@@ -1,26 +1,144 @@
-import json
 import random
+import time
+from datetime import datetime
 from typing import Dict, List, Optional
 from models import GameRoom, Challenge
+from utils.challenge_catalog import ChallengeCatalog
+from utils.challenge_stats import ChallengeAnalytics
+from utils.room_pool import RoomPool
+from utils.room_codes import RoomCodeAllocator
 import config
 
+DIFFICULTY_TIERS = ('easy', 'medium', 'hard')
+
 class GameManager:
     def __init__(self):
         self.rooms: Dict[str, GameRoom] = {}
-        self.challenges_pool = self.load_challenges()
-    
-    def load_challenges(self) -> List[Challenge]:
-        """Carregar desafios do arquivo JSON"""
-        try:
-            with open(config.Config.CHALLENGES_FILE, 'r', encoding='utf-8') as file:
-                challenges_data = json.load(file)
-                return [Challenge(challenge_data) for challenge_data in challenges_data]
-        except FileNotFoundError:
-            print(f"Arquivo de desafios não encontrado: {config.Config.CHALLENGES_FILE}")
-            return self.get_default_challenges()
-        except json.JSONDecodeError:
-            print("Erro ao decodificar arquivo JSON de desafios")
-            return self.get_default_challenges()
+        self.ready = False
+        self.catalog = ChallengeCatalog(
+            packs_dir=config.Config.CHALLENGE_PACKS_DIR,
+            default_pack=config.Config.DEFAULT_CHALLENGE_PACK,
+            default_file=config.Config.CHALLENGES_FILE,
+            max_resident=config.Config.MAX_RESIDENT_PACKS,
+            check_interval=config.Config.PACK_RELOAD_CHECK_INTERVAL,
+            fallback=self.get_default_challenges,
+            cache_dir=config.Config.CHALLENGE_CACHE_DIR
+        )
+        self.analytics = ChallengeAnalytics(config.Config.CHALLENGE_STATS_FILE)
+        # Níveis de dificuldade por pacote: {pacote: (lista do pacote, calculado_em, níveis)}
+        self.difficulty_cache: Dict[str, tuple] = {}
+        # Códigos de sala únicos (reservados enquanto a sala existir)
+        self.room_codes = RoomCodeAllocator(reuse_delay=config.Config.ROOM_CODE_REUSE_DELAY)
+        # Salas vazias com desafios já sorteados, reabastecidas em segundo plano
+        self.room_pool = RoomPool(
+            build=self.build_room,
+            current_challenges=self.load_challenges,
+            default_pack=config.Config.DEFAULT_CHALLENGE_PACK,
+            min_size=config.Config.ROOM_POOL_MIN_SIZE,
+            max_size=config.Config.ROOM_POOL_MAX_SIZE,
+            window=config.Config.ROOM_POOL_DEMAND_WINDOW
+        )
+    
+    @property
+    def challenges_pool(self) -> List[Challenge]:
+        """Desafios do pacote padrão (carregado no primeiro uso)"""
+        return self.catalog.get_pack(config.Config.DEFAULT_CHALLENGE_PACK)
+    
+    def load_challenges(self, pack: str = None) -> List[Challenge]:
+        """Carregar desafios de um pacote (padrão: challenges.json)"""
+        return self.catalog.get_pack(pack)
+    
+    def warm_up(self):
+        """Carregar o pacote padrão e marcar o worker como pronto (uma vez, no warmup)"""
+        self.load_challenges()
+        self.ready = True
+    
+    def is_ready(self) -> bool:
+        """
+        Verificar se o warmup terminou (pronto para criar salas). Não depende do
+        pacote padrão continuar no LRU do catálogo: se for descartado, ele é
+        recarregado no próximo uso.
+        """
+        return self.ready
+    
+    def pack_exists(self, pack: str) -> bool:
+        """Verificar se um pacote de desafios existe"""
+        return self.catalog.pack_exists(pack)
+    
+    def sample_challenges(self, pack: str = None) -> List[Challenge]:
+        """
+        Sortear desafios de um pacote para uma partida.
+        Com BALANCED_SAMPLING, a partida recebe partes iguais de desafios
+        fáceis, médios e difíceis (segundo as estatísticas de respostas).
+        """
+        pool = self.load_challenges(pack)
+        count = min(config.Config.CHALLENGES_PER_GAME, len(pool))
+        if not config.Config.BALANCED_SAMPLING:
+            return random.sample(pool, count)
+        
+        tiers = [tier for tier in self.difficulty_tiers(pack, pool).values() if tier]
+        if len(tiers) < 2:
+            return random.sample(pool, count)
+        
+        selected = []
+        for tier in tiers:
+            selected.extend(random.sample(tier, min(count // len(tiers), len(tier))))
+        
+        # Completar com desafios ainda não escolhidos de qualquer nível
+        if len(selected) < count:
+            chosen = set(map(id, selected))
+            remaining = [challenge for challenge in pool if id(challenge) not in chosen]
+            selected.extend(random.sample(remaining, count - len(selected)))
+        
+        random.shuffle(selected)
+        return selected
+    
+    def difficulty_tiers(self, pack: str, pool: List[Challenge]) -> Dict[str, List[Challenge]]:
+        """
+        Classificar os desafios do pacote por aproveitamento dos jogadores.
+        Desafios com poucas tentativas ficam como 'medium'. O resultado é
+        reaproveitado por DIFFICULTY_REFRESH_INTERVAL segundos.
+        """
+        pack = pack or config.Config.DEFAULT_CHALLENGE_PACK
+        cached = self.difficulty_cache.get(pack)
+        now = time.monotonic()
+        if cached and cached[0] is pool and now - cached[1] < config.Config.DIFFICULTY_REFRESH_INTERVAL:
+            return cached[2]
+        
+        tiers = {tier: [] for tier in DIFFICULTY_TIERS}
+        rates = self.analytics.success_rates(pool, config.Config.DIFFICULTY_MIN_ATTEMPTS)
+        for challenge, rate in zip(pool, rates):
+            tiers[self.classify_difficulty(rate)].append(challenge)
+        
+        self.difficulty_cache[pack] = (pool, now, tiers)
+        return tiers
+    
+    def classify_difficulty(self, success_rate: Optional[float]) -> str:
+        if success_rate is None:
+            return 'medium'
+        if success_rate >= config.Config.DIFFICULTY_EASY_RATE:
+            return 'easy'
+        if success_rate < config.Config.DIFFICULTY_HARD_RATE:
+            return 'hard'
+        return 'medium'
+    
+    def get_challenge_stats(self, pack: str = None) -> List[dict]:
+        """Estatísticas de respostas de cada desafio do pacote"""
+        pool = self.load_challenges(pack)
+        rates = self.analytics.success_rates(pool, config.Config.DIFFICULTY_MIN_ATTEMPTS)
+        
+        result = []
+        for challenge, rate in zip(pool, rates):
+            stats = self.analytics.get(challenge.key)
+            entry = {
+                'key': challenge.key,
+                'type': challenge.type,
+                'title': challenge.question or challenge.description,
+                'difficulty': self.classify_difficulty(rate),
+            }
+            entry.update(stats.to_dict() if stats else {'attempts': 0})
+            result.append(entry)
+        return result
     
     def get_default_challenges(self) -> List[Challenge]:
         """Desafios padrão caso não consiga carregar do arquivo"""
@@ -55,33 +173,55 @@ class GameManager:
         ]
         return [Challenge(challenge) for challenge in default_data]
     
-    def create_empty_room(self, room_id: str) -> GameRoom:
-        """Criar uma sala vazia (sem jogadores ainda)"""
-        room = GameRoom(room_id, None, None, None)
-        
-        selected_challenges = random.sample(
-            self.challenges_pool, 
-            min(config.Config.CHALLENGES_PER_GAME, len(self.challenges_pool))
-        )
-        room.set_challenges(selected_challenges)
+    def build_room(self, pack: str) -> GameRoom:
+        """Montar sala vazia, ainda sem código, com os desafios sorteados"""
+        room = GameRoom(None, None, None, None)
+        room.challenge_pack = pack
+        room.set_challenges(self.sample_challenges(pack))
+        return room
+    
+    def create_empty_room(self, room_id: str, pack: str = None,
+                          challenges: List[Challenge] = None) -> GameRoom:
+        """Criar uma sala vazia (sem jogadores ainda); challenges fixa a sequência de desafios"""
+        pack = pack or config.Config.DEFAULT_CHALLENGE_PACK
+        if challenges is not None:
+            room = GameRoom(room_id, None, None, None)
+            room.challenge_pack = pack
+            room.set_challenges(list(challenges))
+        else:
+            # Sala pré-montada do pool; se estiver vazio, montar na hora
+            room = self.room_pool.take(room_id, pack)
+            if room is None:
+                room = self.build_room(pack)
+                room.id = room_id
         
-        self.rooms[room_id] = room
+        self.register_room(room)
         return room
     
-    def create_room(self, room_id: str, host_name: str, host_id: str = None, host_avatar: str = None) -> GameRoom:
+    def create_room(self, room_id: str, host_name: str, host_id: str = None, host_avatar: str = None,
+                    pack: str = None) -> GameRoom:
         """Criar uma nova sala"""
         if host_id is None:
             host_id = f"host_{room_id}"
         
         room = GameRoom(room_id, host_id, host_name, host_avatar)
+        room.challenge_pack = pack or config.Config.DEFAULT_CHALLENGE_PACK
+        room.set_challenges(self.sample_challenges(room.challenge_pack))
         
-        selected_challenges = random.sample(
-            self.challenges_pool, 
-            min(config.Config.CHALLENGES_PER_GAME, len(self.challenges_pool))
-        )
-        room.set_challenges(selected_challenges)
-        
-        self.rooms[room_id] = room
+        self.register_room(room)
+        return room
+    
+    def register_room(self, room: GameRoom):
+        """Adicionar sala ao processo, com as respostas alimentando as estatísticas"""
+        room.answer_observer = self.analytics.record
+        self.room_codes.reserve(room.id)
+        self.rooms[room.id] = room
+    
+    def delete_room(self, room_id: str) -> Optional[GameRoom]:
+        """Remover sala do processo e liberar o código"""
+        room = self.rooms.pop(room_id, None)
+        if room:
+            self.room_codes.release(room_id)
         return room
     
     def get_room(self, room_id: str) -> Optional[GameRoom]:
@@ -103,6 +243,7 @@ class GameManager:
             # Atualizar dados se já existe
             room.players[player_id].name = player_name
             room.players[player_id].avatar = avatar or '👤'
+            room.touch()
             return True
         
         # Adicionar novo jogador
@@ -117,7 +258,7 @@ class GameManager:
         success = room.remove_player(player_id)
         
         if not room.players:
-            del self.rooms[room_id]
+            self.delete_room(room_id)
         
         return success
     
@@ -146,7 +287,8 @@ class GameManager:
         challenge = room.get_current_challenge()
         return challenge.to_dict() if challenge else None
     
-    def check_answer(self, room_id: str, player_id: str, answer: str) -> tuple:
+    def check_answer(self, room_id: str, player_id: str, answer: str, received_at: float = None,
+                     latency: float = 0.0) -> tuple:
         """
         Verificar resposta do jogador
         Retorna (is_correct, points_earned)
@@ -159,7 +301,7 @@ class GameManager:
         if player_id in room.players and room.players[player_id].answered_current_round:
             return False, 0
         
-        is_correct, points = room.submit_answer(player_id, answer)
+        is_correct, points = room.submit_answer(player_id, answer, received_at, latency)
         return is_correct, points
     
     def all_players_answered(self, room_id: str) -> bool:
@@ -243,13 +385,77 @@ class GameManager:
         
         return room_data
     
-    def cleanup_empty_rooms(self):
-        """Limpar salas vazias (pode ser chamado periodicamente)"""
-        empty_rooms = [room_id for room_id, room in self.rooms.items() if not room.players]
-        for room_id in empty_rooms:
-            del self.rooms[room_id]
+    def get_room_version(self, room_id: str) -> Optional[int]:
+        """Obter versão atual do estado da sala (None se não existir)"""
+        room = self.get_room(room_id)
+        if not room:
+            return None
+        
+        return room.version
+    
+    def get_room_status(self, room_id: str) -> dict:
+        """Obter status resumido da sala (usado pela consulta de várias salas)"""
+        room = self.get_room(room_id)
+        if not room:
+            return {'exists': False}
+        
+        return {
+            'exists': True,
+            'version': room.version,
+            'player_count': len(room.players),
+            'game_started': room.game_started,
+            'game_ended': room.game_ended,
+            'current_challenge_index': room.current_challenge_index,
+            'total_challenges': len(room.challenges)
+        }
+    
+    def export_room(self, room_id: str) -> Optional[dict]:
+        """Remover a sala deste processo e retornar seu estado serializado"""
+        room = self.delete_room(room_id)
+        if not room:
+            return None
+        
+        return room.to_state()
+    
+    def import_room(self, state: dict) -> bool:
+        """Restaurar uma sala serializada (False se o código já estiver em uso)"""
+        if state['id'] in self.rooms:
+            return False
+        
+        self.register_room(GameRoom.from_state(state))
+        return True
+    
+    def rekey_player(self, room_id: str, old_id: str, new_id: str) -> bool:
+        """Associar jogador existente a uma nova conexão"""
+        room = self.get_room(room_id)
+        if not room:
+            return False
+        
+        return room.rekey_player(old_id, new_id)
+    
+    def is_tournament_room(self, room_id: str) -> bool:
+        """Verificar se a sala faz parte de um torneio (rodadas controladas pelo organizador)"""
+        room = self.get_room(room_id)
+        return bool(room and room.tournament_id)
+    
+    def is_expired_empty_room(self, room: GameRoom, max_age: float) -> bool:
+        """Sala que ninguém entrou em max_age segundos (salas de torneio ficam reservadas)"""
+        age = (datetime.now() - room.created_at).total_seconds()
+        return not room.players and not room.tournament_id and age > max_age
+    
+    def get_expired_empty_rooms(self, max_age: float) -> List[str]:
+        """Listar salas vazias expiradas (a remoção deve passar pelo ator da sala)"""
+        return [room_id for room_id, room in list(self.rooms.items())
+                if self.is_expired_empty_room(room, max_age)]
+    
+    def delete_expired_empty_room(self, room_id: str, max_age: float) -> bool:
+        """Remover a sala e liberar o código se ainda estiver vazia e expirada"""
+        room = self.get_room(room_id)
+        if not room or not self.is_expired_empty_room(room, max_age):
+            return False
         
-        return len(empty_rooms)
+        self.delete_room(room_id)
+        return True
     
     def reset_game(self, room_id: str) -> bool:
         """Resetar o jogo mantendo os jogadores"""
@@ -261,15 +467,13 @@ class GameManager:
             player.score = 0
             player.reset_round()
         
-        selected_challenges = random.sample(
-            self.challenges_pool, 
-            min(config.Config.CHALLENGES_PER_GAME, len(self.challenges_pool))
-        )
-        room.set_challenges(selected_challenges)
+        room.set_challenges(self.sample_challenges(room.challenge_pack))
         
         room.current_challenge_index = -1
         room.game_started = False
         room.game_ended = False
         room.round_start_time = None
+        room.round_start_monotonic = None
+        room.touch()
         
         return True
\ No newline at end of file
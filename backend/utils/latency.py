@@ -0,0 +1,72 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+
+class RttEstimate:
+    """Estimativa suavizada de RTT de uma conexão (mesmo esquema do TCP: SRTT/RTTVAR)"""
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(self, sample: float):
+        self.srtt = sample
+        self.rttvar = sample / 2
+        self.last_sample = sample
+        self.samples = 1
+
+    def update(self, sample: float):
+        self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - sample)
+        self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * sample
+        self.last_sample = sample
+        self.samples += 1
+
+
+class RttTracker:
+    """RTT estimado por conexão (sid), alimentado pelas sondas rtt_ping"""
+
+    def __init__(self):
+        self.estimates: Dict[str, RttEstimate] = {}
+        self.lock = threading.Lock()
+
+    def record(self, sid: str, sample: float):
+        """Registrar uma nova amostra de RTT (segundos)"""
+        if sample < 0:
+            return
+        with self.lock:
+            estimate = self.estimates.get(sid)
+            if estimate is None:
+                self.estimates[sid] = RttEstimate(sample)
+            else:
+                estimate.update(sample)
+
+    def get(self, sid: str) -> Optional[float]:
+        """RTT suavizado da conexão (None se ainda não medido)"""
+        with self.lock:
+            estimate = self.estimates.get(sid)
+            return estimate.srtt if estimate else None
+
+    def remove(self, sid: str):
+        with self.lock:
+            self.estimates.pop(sid, None)
+
+    def distribution(self, sids: Iterable[str]) -> dict:
+        """Distribuição dos RTTs suavizados de um conjunto de conexões (em ms)"""
+        with self.lock:
+            values = sorted(
+                self.estimates[sid].srtt * 1000 for sid in sids if sid in self.estimates
+            )
+
+        if not values:
+            return {'count': 0}
+
+        def percentile(pct):
+            return round(values[min(len(values) - 1, int(pct / 100 * len(values)))], 2)
+
+        return {
+            'count': len(values),
+            'mean': round(sum(values) / len(values), 2),
+            'p50': percentile(50),
+            'p90': percentile(90),
+            'p99': percentile(99),
+            'max': round(values[-1], 2)
+        }
@@ -0,0 +1,77 @@
+import hmac
+import json
+import secrets
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+MIGRATION_SECRET_HEADER = 'X-Migration-Secret'
+
+
+def check_secret(expected: Optional[str], received: Optional[str]) -> bool:
+    """Comparar o segredo de migração em tempo constante"""
+    if not expected or not received:
+        return False
+    return hmac.compare_digest(expected.encode('utf-8'), received.encode('utf-8'))
+
+
+def new_resume_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+def send_rooms(successor_url: str, secret: str, rooms: List[dict], timeout: float = 30) -> dict:
+    """
+    Enviar lote de salas serializadas ao processo sucessor.
+    Retorna a resposta JSON ({'accepted': [...], 'rejected': [...]}).
+    """
+    body = json.dumps({'rooms': rooms}).encode('utf-8')
+    request = urllib.request.Request(
+        successor_url.rstrip('/') + '/internal/migrate',
+        data=body,
+        method='POST',
+        headers={'Content-Type': 'application/json', MIGRATION_SECRET_HEADER: secret}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+class ResumeRegistry:
+    """
+    Tokens de retomada de sessão emitidos na migração.
+    Cada token aponta para (sala, ID antigo do jogador, dados da sessão)
+    e expira após ttl segundos se o cliente não reconectar.
+    """
+
+    def __init__(self, ttl: float = 120):
+        self.ttl = ttl
+        self.entries: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def add(self, token: str, room_id: str, old_sid: str, player_info: dict):
+        with self.lock:
+            self.entries[token] = {
+                'room_id': room_id,
+                'old_sid': old_sid,
+                'player_info': player_info,
+                'expires_at': time.monotonic() + self.ttl
+            }
+
+    def pop(self, token: str) -> Optional[dict]:
+        """Consumir um token válido (uso único)"""
+        with self.lock:
+            entry = self.entries.pop(token, None)
+        if entry and entry['expires_at'] < time.monotonic():
+            return None
+        return entry
+
+    def pop_expired(self) -> List[dict]:
+        """Remover e retornar tokens expirados"""
+        now = time.monotonic()
+        with self.lock:
+            expired = [token for token, entry in self.entries.items() if entry['expires_at'] < now]
+            return [self.entries.pop(token) for token in expired]
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
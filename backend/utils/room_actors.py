@@ -0,0 +1,164 @@
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+def shard_for(room_id: str, shards: int) -> int:
+    """Shard estável de uma sala (mesmo valor em qualquer processo)"""
+    return zlib.crc32(str(room_id).encode('utf-8')) % shards
+
+
+class Outbox:
+    """
+    Emissões acumuladas durante um lote de eventos de uma sala.
+    Emissões com o mesmo coalesce_key são substituídas pela mais recente,
+    de modo que um lote envia apenas o último estado (ex.: lista de jogadores).
+    """
+
+    def __init__(self):
+        self.messages: List[Tuple[Optional[Any], str, Any, dict]] = []
+
+    def emit(self, event: str, data: Any = None, coalesce_key: Any = None, **kwargs):
+        self.messages.append((coalesce_key, event, data, kwargs))
+
+    def drain(self) -> List[Tuple[str, Any, dict]]:
+        """Retornar emissões na ordem, descartando as substituídas"""
+        seen = set()
+        pending = []
+        for coalesce_key, event, data, kwargs in reversed(self.messages):
+            if coalesce_key is not None:
+                if coalesce_key in seen:
+                    continue
+                seen.add(coalesce_key)
+            pending.append((event, data, kwargs))
+        self.messages = []
+        pending.reverse()
+        return pending
+
+
+class RoomActor:
+    """Caixa de entrada de uma sala; processada por no máximo um worker por vez"""
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.mailbox: Deque[Tuple[Callable, tuple, Optional[Future]]] = deque()
+        self.scheduled = False
+
+
+class RoomActorSystem:
+    """
+    Executa os eventos de cada sala em ordem, um lote por vez.
+
+    Cada sala ativa possui uma caixa de entrada. Ao receber a primeira mensagem
+    um worker é agendado; ele processa até max_batch mensagens, envia as
+    emissões acumuladas de uma só vez e é liberado quando a caixa esvazia.
+    Salas ociosas não possuem worker nem ator.
+
+    Modos de execução:
+      - 'green': workers via start_background_task (greenthreads no eventlet)
+      - 'threads': salas distribuídas entre threads do SO por shard_for(),
+        garantindo afinidade sala -> thread
+    """
+
+    def __init__(self, emit: Callable, spawn: Callable = None, mode: str = 'green',
+                 threads: int = 4, max_batch: int = 32):
+        self.emit = emit
+        self.mode = mode
+        self.max_batch = max_batch
+        self.actors: Dict[str, RoomActor] = {}
+        self.lock = threading.Lock()
+
+        if mode == 'threads':
+            self.executors = [
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'room-shard-{index}')
+                for index in range(threads)
+            ]
+            self.spawn = None
+        elif mode == 'green':
+            if spawn is None:
+                raise ValueError("Modo 'green' requer uma função spawn")
+            self.executors = []
+            self.spawn = spawn
+        else:
+            raise ValueError(f'Modo de execução desconhecido: {mode}')
+
+    @property
+    def threaded(self) -> bool:
+        return self.mode == 'threads'
+
+    def post(self, room_id: str, handler: Callable, *args) -> Future:
+        """
+        Enfileirar handler(outbox, *args) na caixa de entrada da sala.
+        Retorna um Future com o resultado do handler.
+        """
+        future = Future()
+        with self.lock:
+            actor = self.actors.get(room_id)
+            if actor is None:
+                actor = RoomActor(room_id)
+                self.actors[room_id] = actor
+            actor.mailbox.append((handler, args, future))
+            schedule = not actor.scheduled
+            actor.scheduled = True
+
+        if schedule:
+            self._schedule(actor)
+        return future
+
+    def call(self, room_id: str, handler: Callable, *args) -> Any:
+        """
+        Executar handler(*args) serializado com os eventos da sala e aguardar o
+        resultado. No modo 'green' o escalonamento cooperativo já garante a
+        exclusão, então a chamada é feita diretamente.
+        """
+        if not self.threaded:
+            return handler(*args)
+
+        future = self.post(room_id, lambda outbox: handler(*args))
+        return future.result()
+
+    def active_rooms(self) -> int:
+        """Número de salas com worker agendado ou em execução"""
+        with self.lock:
+            return len(self.actors)
+
+    def shutdown(self):
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+
+    def _schedule(self, actor: RoomActor):
+        if self.threaded:
+            executor = self.executors[shard_for(actor.room_id, len(self.executors))]
+            executor.submit(self._run, actor)
+        else:
+            self.spawn(self._run, actor)
+
+    def _run(self, actor: RoomActor):
+        """Processar a caixa de entrada em lotes até esvaziá-la"""
+        outbox = Outbox()
+        while True:
+            with self.lock:
+                batch = []
+                while actor.mailbox and len(batch) < self.max_batch:
+                    batch.append(actor.mailbox.popleft())
+
+                if not batch:
+                    actor.scheduled = False
+                    if self.actors.get(actor.room_id) is actor:
+                        del self.actors[actor.room_id]
+                    return
+
+            for handler, args, future in batch:
+                try:
+                    future.set_result(handler(outbox, *args))
+                except Exception as e:
+                    print(f"Erro no ator da sala {actor.room_id}: {str(e)}")
+                    future.set_exception(e)
+
+            for event, data, kwargs in outbox.drain():
+                try:
+                    self.emit(event, data, **kwargs)
+                except Exception as e:
+                    print(f"Erro ao emitir {event} para sala {actor.room_id}: {str(e)}")
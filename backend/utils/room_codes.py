@@ -0,0 +1,131 @@
+import collections
+import random
+import secrets
+import threading
+import time
+from typing import Deque, Optional, Set, Tuple
+
+# Sem caracteres ambíguos (0/O, 1/I/L); só letras maiúsculas e dígitos,
+# compatível com validate_room_id em utils/auth.py
+ROOM_CODE_ALPHABET = '23456789ABCDEFGHJKMNPQRSTUVWXYZ'
+ROOM_CODE_LENGTH = 8
+
+_BASE = len(ROOM_CODE_ALPHABET)
+_SPACE = _BASE ** ROOM_CODE_LENGTH  # ~8.5e11 códigos
+_HALF_BITS = ((_SPACE - 1).bit_length() + 1) // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+_TABLE_BITS = _HALF_BITS // 2
+_TABLE_MASK = (1 << _TABLE_BITS) - 1
+_DIGITS = {char: value for value, char in enumerate(ROOM_CODE_ALPHABET)}
+# Pares de caracteres pré-montados: codificar faz 4 divisões em vez de 8
+_PAIR_BASE = _BASE * _BASE
+_PAIRS = [first + second for first in ROOM_CODE_ALPHABET for second in ROOM_CODE_ALPHABET]
+
+
+def encode_room_code(value: int) -> str:
+    value, fourth = divmod(value, _PAIR_BASE)
+    value, third = divmod(value, _PAIR_BASE)
+    first, second = divmod(value, _PAIR_BASE)
+    return _PAIRS[first] + _PAIRS[second] + _PAIRS[third] + _PAIRS[fourth]
+
+
+def decode_room_code(code: str) -> Optional[int]:
+    """Valor numérico do código (None se não for um código deste alfabeto)"""
+    if not isinstance(code, str) or len(code) != ROOM_CODE_LENGTH:
+        return None
+    value = 0
+    for char in code:
+        digit = _DIGITS.get(char)
+        if digit is None:
+            return None
+        value = value * _BASE + digit
+    return value
+
+
+class RoomCodeAllocator:
+    """
+    Alocador de códigos de sala únicos.
+
+    Os códigos novos vêm de um contador passado por uma permutação pseudo-
+    aleatória (rede de Feistel com tabelas sorteadas + cycle walking) do espaço
+    de 31^8 códigos: contadores distintos geram códigos distintos, então a
+    alocação é O(1) e não depende de sorte, e os códigos não são sequenciais
+    (não dá para adivinhar a próxima sala).
+
+    Códigos liberados voltam para uma fila e só são reutilizados após
+    reuse_delay segundos, para links e caches antigos não caírem em outra
+    sala. Códigos vindos de fora (salas migradas, códigos legados) são
+    registrados com reserve() e nunca são alocados enquanto estiverem vivos.
+    Os códigos vivos ficam em um conjunto de inteiros.
+    """
+
+    def __init__(self, reuse_delay: float = 600, seed: int = None):
+        self.reuse_delay = reuse_delay
+        # Função de rodada: duas tabelas aleatórias por rodada, indexadas pelas
+        # metades do bloco (qualquer função mantém a rede de Feistel bijetora)
+        rng = random.Random(seed if seed is not None else secrets.randbits(64))
+        self.tables = [
+            ([rng.getrandbits(_HALF_BITS) for _ in range(1 << _TABLE_BITS)],
+             [rng.getrandbits(_HALF_BITS) for _ in range(1 << (_HALF_BITS - _TABLE_BITS))])
+            for _ in range(_ROUNDS)
+        ]
+        self.counter = 0
+        self.live: Set[int] = set()
+        self.released: Deque[Tuple[float, int]] = collections.deque()
+        self.lock = threading.Lock()
+
+    def _permute(self, index: int) -> int:
+        """Permutação de [0, 31^8): Feistel em 2*_HALF_BITS bits + cycle walking"""
+        value = index
+        while True:
+            left, right = value >> _HALF_BITS, value & _HALF_MASK
+            for low_table, high_table in self.tables:
+                left, right = right, left ^ low_table[right & _TABLE_MASK] ^ high_table[right >> _TABLE_BITS]
+            value = (left << _HALF_BITS) | right
+            if value < _SPACE:
+                return value
+
+    def allocate(self) -> str:
+        """Alocar um código que não está em uso"""
+        with self.lock:
+            while True:
+                if self.released and self.released[0][0] <= time.monotonic():
+                    value = self.released.popleft()[1]
+                else:
+                    if self.counter >= _SPACE:
+                        raise RuntimeError('Códigos de sala esgotados')
+                    value = self._permute(self.counter)
+                    self.counter += 1
+
+                # Pode já estar vivo se foi reservado depois de liberado/gerado
+                if value not in self.live:
+                    self.live.add(value)
+                    return encode_room_code(value)
+
+    def reserve(self, code: str) -> bool:
+        """Marcar como em uso um código criado fora do alocador"""
+        value = decode_room_code(code)
+        if value is None:
+            # Códigos fora do alfabeto (ex.: legados com 0 ou 1) nunca são alocados
+            return False
+        with self.lock:
+            self.live.add(value)
+        return True
+
+    def release(self, code: str):
+        """Devolver um código; volta a ser alocável após reuse_delay segundos"""
+        value = decode_room_code(code)
+        if value is None:
+            return
+        with self.lock:
+            if value in self.live:
+                self.live.remove(value)
+                self.released.append((time.monotonic() + self.reuse_delay, value))
+
+    def is_live(self, code: str) -> bool:
+        value = decode_room_code(code)
+        return value is not None and value in self.live
+
+    def __len__(self) -> int:
+        return len(self.live)
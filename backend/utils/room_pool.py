@@ -0,0 +1,110 @@
+import collections
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from models import GameRoom
+
+
+class RoomPool:
+    """
+    Salas vazias pré-montadas, com os desafios já sorteados, por pacote.
+
+    create_empty_room retira uma sala pronta do pool (só atribui o código),
+    tirando o sorteio do caminho da requisição. O pool é reabastecido em
+    segundo plano por refill(); o tamanho alvo de cada pacote acompanha o
+    número de salas criadas na última janela de window segundos, entre
+    min_size (só o pacote padrão) e max_size. Salas montadas com uma versão
+    anterior do pacote (recarga do arquivo) são descartadas na retirada.
+    """
+
+    def __init__(self, build: Callable[[str], GameRoom], current_challenges: Callable[[str], list],
+                 default_pack: str, min_size: int = 4, max_size: int = 200, window: float = 60):
+        self.build = build
+        self.current_challenges = current_challenges
+        self.default_pack = default_pack
+        self.min_size = min_size
+        self.max_size = max_size
+        self.window = window
+        # pacote -> salas prontas (sala, lista de desafios do pacote usada no sorteio)
+        self.ready: Dict[str, Deque[Tuple[GameRoom, list]]] = {}
+        self.demand: Deque[Tuple[float, str]] = collections.deque(maxlen=max(1000, max_size * 20))
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def take(self, room_id: str, pack: str) -> Optional[GameRoom]:
+        """Retirar uma sala pronta do pacote e atribuir o código (None se vazio)"""
+        current = self.current_challenges(pack)
+        with self.lock:
+            self.demand.append((time.monotonic(), pack))
+            queue = self.ready.get(pack)
+            while queue:
+                room, challenges = queue.popleft()
+                if challenges is current:
+                    self.hits += 1
+                    break
+            else:
+                self.misses += 1
+                return None
+
+        room.id = room_id
+        room.created_at = datetime.now()
+        room.touch()
+        return room
+
+    def target_sizes(self) -> Dict[str, int]:
+        """Tamanho alvo de cada pacote, pela taxa recente de criação de salas"""
+        cutoff = time.monotonic() - self.window
+        with self.lock:
+            while self.demand and self.demand[0][0] < cutoff:
+                self.demand.popleft()
+            recent = collections.Counter(pack for _, pack in self.demand)
+
+        targets = {pack: min(self.max_size, count) for pack, count in recent.items()}
+        targets[self.default_pack] = max(self.min_size, targets.get(self.default_pack, 0))
+        return targets
+
+    def refill(self, limit: int) -> int:
+        """
+        Montar até limit salas para os pacotes abaixo do alvo e descartar as
+        excedentes de pacotes sem procura. Retorna quantas salas foram montadas.
+        """
+        targets = self.target_sizes()
+        with self.lock:
+            for pack in list(self.ready):
+                excess = len(self.ready[pack]) - targets.get(pack, 0)
+                for _ in range(max(0, excess)):
+                    self.ready[pack].pop()
+                if not self.ready[pack]:
+                    del self.ready[pack]
+            missing = [
+                (pack, target - len(self.ready.get(pack, ())))
+                for pack, target in targets.items()
+            ]
+
+        built = 0
+        for pack, count in missing:
+            for _ in range(min(count, limit - built)):
+                try:
+                    challenges = self.current_challenges(pack)
+                    room = self.build(pack)
+                except KeyError:
+                    # Pacote removido do disco
+                    break
+                with self.lock:
+                    self.ready.setdefault(pack, collections.deque()).append((room, challenges))
+                built += 1
+        return built
+
+    def stats(self) -> dict:
+        targets = self.target_sizes()
+        with self.lock:
+            ready = {pack: len(queue) for pack, queue in self.ready.items()}
+        return {
+            'ready': ready,
+            'targets': targets,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,188 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_IDENTITY_LENGTH = 64
+
+
+class Session:
+    """Conexão (sid) de um jogador e a sala em que ele está"""
+
+    __slots__ = ('sid', 'room_id', 'player_name', 'avatar', 'identity', 'joined_at')
+
+    def __init__(self, sid: str, room_id: str, player_name: str, avatar: str = None,
+                 identity: str = None):
+        self.sid = sid
+        self.room_id = room_id
+        self.player_name = player_name
+        self.avatar = avatar
+        # Identidade estável do cliente (compartilhada entre abas/dispositivos);
+        # sem ela, cada conexão é a sua própria identidade
+        self.identity = identity or sid
+        self.joined_at = time.time()
+
+    def to_dict(self) -> dict:
+        """Formato serializável (migração entre processos)"""
+        return {
+            'room_id': self.room_id,
+            'player_name': self.player_name,
+            'avatar': self.avatar,
+            # Identidade implícita (o próprio sid) não sobrevive à troca de conexão
+            'identity': self.identity if self.identity != self.sid else None
+        }
+
+    @classmethod
+    def from_dict(cls, sid: str, data: dict) -> 'Session':
+        return cls(sid, data['room_id'], data.get('player_name'), data.get('avatar'), data.get('identity'))
+
+
+def normalize_identity(identity) -> Optional[str]:
+    """Aceitar apenas identidades de cliente em formato razoável"""
+    if not isinstance(identity, str):
+        return None
+    identity = identity.strip()
+    if not identity or len(identity) > MAX_IDENTITY_LENGTH:
+        return None
+    return identity
+
+
+class SessionRegistry:
+    """
+    Registro único de quem está conectado e onde.
+
+    Mantém três índices consistentes entre si, todos com busca O(1):
+      - sid -> Session
+      - sala -> sids
+      - identidade -> sids (uma identidade pode ter várias abas/dispositivos)
+
+    Desconectar (disconnect, pop) e remover uma sala inteira (evict_room)
+    atualizam os três índices sem percorrer as demais sessões.
+
+    Também guarda as conexões abertas: entradas em sala ficam na fila do ator
+    e podem rodar depois da desconexão, então bind e restore recusam conexões
+    já encerradas (senão o jogador ficaria na sala sem ninguém para removê-lo).
+    """
+
+    def __init__(self):
+        self.connected: Set[str] = set()
+        self.by_sid: Dict[str, Session] = {}
+        self.by_room: Dict[str, Set[str]] = {}
+        self.by_identity: Dict[str, Set[str]] = {}
+        self.lock = threading.Lock()
+
+    def _index(self, session: Session):
+        self.by_sid[session.sid] = session
+        self.by_room.setdefault(session.room_id, set()).add(session.sid)
+        self.by_identity.setdefault(session.identity, set()).add(session.sid)
+
+    def _unindex(self, session: Session):
+        del self.by_sid[session.sid]
+
+        room_sids = self.by_room.get(session.room_id)
+        if room_sids is not None:
+            room_sids.discard(session.sid)
+            if not room_sids:
+                del self.by_room[session.room_id]
+
+        identity_sids = self.by_identity.get(session.identity)
+        if identity_sids is not None:
+            identity_sids.discard(session.sid)
+            if not identity_sids:
+                del self.by_identity[session.identity]
+
+    def connect(self, sid: str):
+        """Registrar conexão aberta"""
+        with self.lock:
+            self.connected.add(sid)
+
+    def disconnect(self, sid: str) -> Optional[Session]:
+        """Encerrar a conexão e remover sua sessão (bind posteriores são recusados)"""
+        with self.lock:
+            self.connected.discard(sid)
+            session = self.by_sid.get(sid)
+            if session is not None:
+                self._unindex(session)
+        return session
+
+    def is_connected(self, sid: str) -> bool:
+        return sid in self.connected
+
+    def bind(self, sid: str, room_id: str, player_name: str, avatar: str = None,
+             identity: str = None) -> Tuple[bool, Optional[Session]]:
+        """
+        Associar a conexão a uma sala.
+        Retorna (associada, sessão anterior da conexão, ex.: estava em outra
+        sala). Conexão já encerrada não é associada: (False, None).
+        """
+        session = Session(sid, room_id, player_name, avatar, identity)
+        with self.lock:
+            if sid not in self.connected:
+                return False, None
+            previous = self.by_sid.get(sid)
+            if previous is not None:
+                self._unindex(previous)
+            self._index(session)
+        return True, previous
+
+    def get(self, sid: str) -> Optional[Session]:
+        return self.by_sid.get(sid)
+
+    def pop(self, sid: str) -> Optional[Session]:
+        """Remover a sessão da conexão, que continua aberta (ex.: outra aba assumiu o jogador)"""
+        with self.lock:
+            session = self.by_sid.get(sid)
+            if session is not None:
+                self._unindex(session)
+        return session
+
+    def in_room(self, sid: str, room_id: str) -> bool:
+        session = self.by_sid.get(sid)
+        return session is not None and session.room_id == room_id
+
+    def identity_sids(self, identity: str) -> List[str]:
+        """Todas as conexões (abas/dispositivos) de uma identidade"""
+        with self.lock:
+            return list(self.by_identity.get(identity, ()))
+
+    def evict_room(self, room_id: str) -> List[Session]:
+        """Remover de uma vez todas as sessões de uma sala"""
+        with self.lock:
+            sessions = [self.by_sid[sid] for sid in self.by_room.get(room_id, ())]
+            for session in sessions:
+                self._unindex(session)
+        return sessions
+
+    def restore(self, sessions: Iterable[Session]) -> List[Session]:
+        """
+        Registrar sessões já montadas (retomada, migração que falhou).
+        Retorna as sessões de conexões já encerradas, que não foram registradas.
+        """
+        closed = []
+        with self.lock:
+            for session in sessions:
+                if session.sid not in self.connected:
+                    closed.append(session)
+                    continue
+                previous = self.by_sid.get(session.sid)
+                if previous is not None:
+                    self._unindex(previous)
+                self._index(session)
+        return closed
+
+    def rooms(self) -> Dict[str, List[str]]:
+        """Cópia do índice sala -> sids"""
+        with self.lock:
+            return {room_id: list(sids) for room_id, sids in self.by_room.items()}
+
+    def sids(self) -> List[str]:
+        with self.lock:
+            return list(self.by_sid)
+
+    def identity_count(self) -> int:
+        return len(self.by_identity)
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self.by_sid
+
+    def __len__(self) -> int:
+        return len(self.by_sid)
@@ -0,0 +1,195 @@
+import heapq
+import itertools
+import secrets
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from models import Challenge, GameRoom
+
+
+class TournamentLeaderboard:
+    """
+    Ranking global de um torneio.
+
+    Cada sala mantém seu placar ordenado em cache, chaveado pela versão da
+    sala; só as salas alteradas desde a última consulta são reordenadas. O
+    top-N global sai de uma intercalação k-way (heap) dos placares das salas,
+    consumida apenas até N entradas, sem percorrer todos os jogadores.
+    """
+
+    def __init__(self):
+        self.room_boards: Dict[str, Tuple[int, List[tuple]]] = {}
+
+    def refresh_room(self, room: GameRoom) -> List[tuple]:
+        """
+        Placar ordenado da sala, reconstruído apenas se a versão mudou.
+        Lê os jogadores da sala: deve rodar serializado com os eventos dela.
+        """
+        cached = self.room_boards.get(room.id)
+        if cached and cached[0] == room.version:
+            return cached[1]
+
+        board = sorted(
+            (-player.score, room.id, player.id, player.name, player.avatar)
+            for player in list(room.players.values())
+        )
+        self.room_boards[room.id] = (room.version, board)
+        return board
+
+    def top(self, boards: List[List[tuple]], limit: int) -> List[dict]:
+        """Top-N global via intercalação k-way dos placares das salas (refresh_room)"""
+        merged = heapq.merge(*boards)
+        return [
+            {
+                'rank': rank,
+                'player_id': player_id,
+                'player_name': name,
+                'avatar': avatar,
+                'room_id': room_id,
+                'score': -negative_score
+            }
+            for rank, (negative_score, room_id, player_id, name, avatar)
+            in enumerate(itertools.islice(merged, limit), start=1)
+        ]
+
+    def forget_room(self, room_id: str):
+        self.room_boards.pop(room_id, None)
+
+
+class Tournament:
+    """Grupo de salas jogando a mesma sequência de desafios em sincronia"""
+
+    def __init__(self, tournament_id: str, room_ids: List[str], challenges: List[Challenge],
+                 pack: str = None):
+        self.id = tournament_id
+        self.room_ids = room_ids
+        self.challenges = challenges
+        self.pack = pack
+        self.organizer_token = secrets.token_urlsafe(16)
+        self.current_challenge_index = -1
+        self.started = False
+        self.ended = False
+        self.leaderboard = TournamentLeaderboard()
+
+    def check_token(self, token: Optional[str]) -> bool:
+        """Verificar token do organizador em tempo constante"""
+        return bool(token) and secrets.compare_digest(token, self.organizer_token)
+
+    def has_next_challenge(self) -> bool:
+        return self.current_challenge_index + 1 < len(self.challenges)
+
+    def to_state(self) -> dict:
+        """Estado completo serializável (migração junto com as salas)"""
+        return {
+            'id': self.id,
+            'room_ids': self.room_ids,
+            'challenges': [challenge.to_state() for challenge in self.challenges],
+            'pack': self.pack,
+            'organizer_token': self.organizer_token,
+            'current_challenge_index': self.current_challenge_index,
+            'started': self.started,
+            'ended': self.ended
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'Tournament':
+        challenges = [Challenge(challenge_data) for challenge_data in state.get('challenges', [])]
+        tournament = cls(state['id'], list(state['room_ids']), challenges, state.get('pack'))
+        tournament.organizer_token = state['organizer_token']
+        tournament.current_challenge_index = state.get('current_challenge_index', -1)
+        tournament.started = state.get('started', False)
+        tournament.ended = state.get('ended', False)
+        return tournament
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'room_ids': self.room_ids,
+            'pack': self.pack,
+            'started': self.started,
+            'ended': self.ended,
+            'current_challenge_index': self.current_challenge_index,
+            'total_challenges': len(self.challenges)
+        }
+
+
+class TournamentCoordinator:
+    """
+    Cria torneios e mantém o estado de rodadas compartilhado entre as salas.
+
+    room_call(room_id, handler, *args) executa handler serializado com os
+    eventos da sala (RoomActorSystem.call); sem ele, a chamada é direta.
+    """
+
+    def __init__(self, game_manager, room_call: Callable = None):
+        self.game_manager = game_manager
+        self.room_call = room_call or (lambda room_id, handler, *args: handler(*args))
+        self.tournaments: Dict[str, Tournament] = {}
+        self.lock = threading.Lock()
+
+    def create_tournament(self, room_ids: List[str], pack: str = None) -> Tournament:
+        """Criar salas vazias que compartilham a mesma lista de desafios"""
+        challenges = self.game_manager.sample_challenges(pack)
+        tournament = Tournament(f'T{secrets.token_hex(4).upper()}', room_ids, challenges, pack)
+
+        for room_id in room_ids:
+            room = self.game_manager.create_empty_room(room_id, pack, challenges)
+            room.tournament_id = tournament.id
+
+        with self.lock:
+            self.tournaments[tournament.id] = tournament
+        return tournament
+
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        return self.tournaments.get(tournament_id)
+
+    def import_tournament(self, state: dict) -> Tournament:
+        """
+        Registrar torneio recebido na migração. As salas chegam em lotes e cada
+        uma traz o torneio: o primeiro cria, os seguintes só atualizam o
+        andamento (exportados depois, então mais recentes)
+        """
+        with self.lock:
+            tournament = self.tournaments.get(state['id'])
+            if tournament is None:
+                tournament = Tournament.from_state(state)
+                self.tournaments[tournament.id] = tournament
+            else:
+                tournament.current_challenge_index = state.get('current_challenge_index', -1)
+                tournament.started = state.get('started', False)
+                tournament.ended = state.get('ended', False)
+        return tournament
+
+    def tournament_room(self, tournament_id: str, room_id: str) -> Optional[GameRoom]:
+        """
+        Sala do torneio pelo código, se ainda pertencer a ele. Códigos de salas
+        encerradas voltam a ser alocados (após ROOM_CODE_REUSE_DELAY) para salas
+        sem relação com o torneio, que não podem ser afetadas pelo organizador.
+        """
+        room = self.game_manager.get_room(room_id)
+        if room and room.tournament_id == tournament_id:
+            return room
+        return None
+
+    def live_rooms(self, tournament: Tournament) -> List[GameRoom]:
+        """Salas do torneio que ainda existem"""
+        rooms = []
+        for room_id in tournament.room_ids:
+            room = self.tournament_room(tournament.id, room_id)
+            if room:
+                rooms.append(room)
+            else:
+                tournament.leaderboard.forget_room(room_id)
+        return rooms
+
+    def get_leaderboard(self, tournament: Tournament, limit: int) -> dict:
+        """Ranking global (top-N) do torneio"""
+        boards = [
+            self.room_call(room.id, tournament.leaderboard.refresh_room, room)
+            for room in self.live_rooms(tournament)
+        ]
+        return {
+            'tournament_id': tournament.id,
+            'round': tournament.current_challenge_index + 1,
+            'total_players': sum(len(board) for board in boards),
+            'top': tournament.leaderboard.top(boards, limit)
+        }
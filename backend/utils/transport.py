@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Callable, Optional
+
+
+class FlaskSocketIOTransport:
+    """Envio pelo servidor Flask-SocketIO (modo eventlet do app.py)"""
+
+    def __init__(self, socketio):
+        self.socketio = socketio
+
+    def emit(self, event: str, data: Any = None, to: str = None, skip_sid: str = None,
+             callback: Callable = None):
+        self.socketio.emit(event, data, to=to, skip_sid=skip_sid, callback=callback, namespace='/')
+
+    def enter_room(self, sid: str, room: str):
+        self.socketio.server.enter_room(sid, room, namespace='/')
+
+    def leave_room(self, sid: str, room: str):
+        self.socketio.server.leave_room(sid, room, namespace='/')
+
+
+class AsyncServerTransport:
+    """
+    Envio pelo socketio.AsyncServer (modo ASGI), que é quem mantém as conexões.
+
+    Pode ser chamado de qualquer thread (atores, rotas REST no pool do
+    WsgiToAsgi, tarefas em segundo plano): as operações entram em uma fila do
+    event loop e são executadas por uma única tarefa, na ordem em que foram
+    pedidas (ex.: enter_room antes do emit para a sala).
+    """
+
+    def __init__(self, sio):
+        self.sio = sio
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queue: Optional[asyncio.Queue] = None
+
+    async def start(self):
+        """Iniciar a tarefa de envio no event loop do servidor (startup do ASGI)"""
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            operation, args, kwargs = await self.queue.get()
+            try:
+                await operation(*args, **kwargs)
+            except Exception as e:
+                print(f"Erro ao enviar pelo Socket.IO: {str(e)}")
+
+    def _submit(self, operation, *args, **kwargs):
+        if self.loop is None:
+            # Servidor ainda não iniciou: não há conexões para receber
+            return
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (operation, args, kwargs))
+
+    def emit(self, event: str, data: Any = None, to: str = None, skip_sid: str = None,
+             callback: Callable = None):
+        self._submit(self.sio.emit, event, data, to=to, skip_sid=skip_sid, callback=callback)
+
+    def enter_room(self, sid: str, room: str):
+        self._submit(self.sio.enter_room, sid, room)
+
+    def leave_room(self, sid: str, room: str):
+        self._submit(self.sio.leave_room, sid, room)
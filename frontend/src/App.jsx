@@ -21,14 +21,24 @@ function App() {
     if (!socket) return
 
     // Escutar eventos do socket
+    // is_host vem do servidor: a aba pode ter assumido o jogador (e o host) de outra
     socket.on('room_joined', (roomData) => {
       setGameState(prev => ({
         ...prev,
         currentRoom: roomData.id,
+        isHost: Boolean(roomData.is_host),
         gameStarted: roomData.game_started
       }))
     })
 
+    const handleSessionResumed = (roomData) => {
+      setGameState(prev => ({
+        ...prev,
+        isHost: Boolean(roomData.is_host)
+      }))
+    }
+    socket.on('session_resumed', handleSessionResumed)
+
     socket.on('game_started', () => {
       setGameState(prev => ({
         ...prev,
@@ -41,10 +51,24 @@ function App() {
       alert(error.message || 'Erro de conexão')
     })
 
+    // O mesmo jogador entrou na sala por outra aba: esta volta ao início
+    socket.on('session_replaced', (data) => {
+      alert(data.message)
+      setGameState({
+        currentRoom: null,
+        playerName: '',
+        isHost: false,
+        avatar: null,
+        gameStarted: false
+      })
+    })
+
     return () => {
       socket.off('room_joined')
       socket.off('game_started')
       socket.off('error')
+      socket.off('session_replaced')
+      socket.off('session_resumed', handleSessionResumed)
     }
   }, [socket])
 
@@ -3,24 +3,79 @@ import { io } from 'socket.io-client'
 
 const SERVER_URL = import.meta.env.VITE_WS_URL || 'http://localhost:5000'
 
+// crypto.randomUUID só existe em contextos seguros (HTTPS/localhost); em
+// endereços HTTP da rede local é preciso gerar o ID de outra forma
+const generateClientId = () => {
+  if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+    return window.crypto.randomUUID()
+  }
+  if (window.crypto && typeof window.crypto.getRandomValues === 'function') {
+    const bytes = window.crypto.getRandomValues(new Uint8Array(16))
+    return Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('')
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+}
+
+// Identidade estável do cliente, compartilhada entre abas do mesmo navegador
+const getClientId = () => {
+  let clientId = localStorage.getItem('clientId')
+  if (!clientId) {
+    clientId = generateClientId()
+    localStorage.setItem('clientId', clientId)
+  }
+  return clientId
+}
+
 export const useSocket = () => {
   const [socket, setSocket] = useState(null)
 
   useEffect(() => {
-    const socketInstance = io(SERVER_URL, {
-      autoConnect: true,
-      transports: ['websocket', 'polling']
-    })
+    let currentSocket = null
 
-    socketInstance.on('connect_error', (error) => {
-      console.error('Erro de conexão:', error)
-    })
+    const connect = (url) => {
+      const socketInstance = io(url, {
+        autoConnect: true,
+        transports: ['websocket', 'polling']
+      })
 
-    setSocket(socketInstance)
+      socketInstance.on('connect_error', (error) => {
+        console.error('Erro de conexão:', error)
+      })
 
-    return () => {
-      if (socketInstance) {
+      // Servidor em drain: reconectar e retomar a sessão no novo processo
+      socketInstance.on('server_migrating', (data) => {
+        sessionStorage.setItem('resumeToken', data.resume_token)
         socketInstance.disconnect()
+        if (data.reconnect_url) {
+          // O token de retomada só existe no sucessor: conectar direto nele
+          connect(data.reconnect_url)
+        } else {
+          socketInstance.connect()
+        }
+      })
+
+      socketInstance.on('connect', () => {
+        const resumeToken = sessionStorage.getItem('resumeToken')
+        if (resumeToken) {
+          sessionStorage.removeItem('resumeToken')
+          socketInstance.emit('resume_session', { resume_token: resumeToken })
+        }
+      })
+
+      // Sonda de latência do servidor: responder imediatamente com o ack
+      socketInstance.on('rtt_ping', (_data, ack) => {
+        if (typeof ack === 'function') ack()
+      })
+
+      currentSocket = socketInstance
+      setSocket(socketInstance)
+    }
+
+    connect(SERVER_URL)
+
+    return () => {
+      if (currentSocket) {
+        currentSocket.disconnect()
       }
     }
   }, [])
@@ -57,6 +112,15 @@ export const useGameSocket = (socket, roomId) => {
       }))
     }
 
+    const handleSessionResumed = (data) => {
+      setGameData(prev => ({
+        ...prev,
+        players: data.players || [],
+        gameStarted: data.game_started || false,
+        currentChallenge: data.current_challenge || prev.currentChallenge
+      }))
+    }
+
     const handleGameStarted = () => {
       setGameData(prev => ({ ...prev, gameStarted: true }))
     }
@@ -109,6 +173,7 @@ export const useGameSocket = (socket, roomId) => {
     socket.on('player_joined', handlePlayerJoined)
     socket.on('player_left', handlePlayerLeft)
     socket.on('room_joined', handleRoomJoined)
+    socket.on('session_resumed', handleSessionResumed)
     socket.on('game_started', handleGameStarted)
     socket.on('new_challenge', handleNewChallenge)
     socket.on('round_results', handleRoundResults)
@@ -121,6 +186,7 @@ export const useGameSocket = (socket, roomId) => {
       socket.off('player_joined', handlePlayerJoined)
       socket.off('player_left', handlePlayerLeft)
       socket.off('room_joined', handleRoomJoined)
+      socket.off('session_resumed', handleSessionResumed)
       socket.off('game_started', handleGameStarted)
       socket.off('new_challenge', handleNewChallenge)
       socket.off('round_results', handleRoundResults)
@@ -136,7 +202,8 @@ export const useGameSocket = (socket, roomId) => {
       socket.emit('join_room', { 
         room_id: roomId, 
         player_name: playerName,
-        avatar: avatar 
+        avatar: avatar,
+        client_id: getClientId()
       })
     }
   }
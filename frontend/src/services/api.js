@@ -36,11 +36,12 @@ api.interceptors.response.use(
 )
 
 // API functions
-export const createRoom = async (playerName, avatar = '😀') => {
+export const createRoom = async (playerName, avatar = '😀', pack = null) => {
   try {
     const response = await api.post('/create-room', {
       player_name: playerName,
-      avatar: avatar  // ← Enviar avatar
+      avatar: avatar,  // ← Enviar avatar
+      ...(pack ? { pack } : {})
     })
     return response.data
   } catch (error) {
@@ -48,11 +49,36 @@ export const createRoom = async (playerName, avatar = '😀') => {
   }
 }
 
+export const getChallengePacks = async () => {
+  try {
+    const response = await api.get('/challenge-packs')
+    return response.data
+  } catch (error) {
+    throw new Error(error.response?.data?.error || 'Erro ao buscar pacotes de desafios')
+  }
+}
+
+// Cache local de respostas de /room (ETag -> dados) para requisições condicionais
+const roomInfoCache = new Map()
+
 export const getRoomInfo = async (roomId) => {
   try {
-    const response = await api.get(`/room/${roomId}`)
+    const cached = roomInfoCache.get(roomId)
+    const response = await api.get(`/room/${roomId}`, {
+      headers: cached ? { 'If-None-Match': cached.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+    })
+
+    if (response.status === 304 && cached) {
+      return cached.data
+    }
+
+    if (response.headers.etag) {
+      roomInfoCache.set(roomId, { etag: response.headers.etag, data: response.data })
+    }
     return response.data
   } catch (error) {
+    roomInfoCache.delete(roomId)
     if (error.response?.status === 404) {
       throw new Error('Sala não encontrada')
     }
@@ -60,6 +86,18 @@ export const getRoomInfo = async (roomId) => {
   }
 }
 
+// Status de várias salas em uma única requisição
+export const getRoomsStatus = async (roomIds) => {
+  try {
+    const response = await api.post('/rooms/status', {
+      room_ids: roomIds
+    })
+    return response.data.rooms
+  } catch (error) {
+    throw new Error(error.response?.data?.error || 'Erro ao buscar status das salas')
+  }
+}
+
 // Função helper para validar formato do room ID
 export const validateRoomId = (roomId) => {
   if (!roomId || typeof roomId !== 'string') {